@@ -1,7 +1,10 @@
 from logging.config import fileConfig
+from sqlalchemy import ForeignKeyConstraint
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from alembic import context
+from alembic import op
+from alembic.ddl.sqlite import SQLiteImpl
 import os
 import sys
 
@@ -22,7 +25,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (não reconfigura o logging quando chamado de dentro da aplicação)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -35,6 +39,31 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+class SQLiteBatchImpl(SQLiteImpl):
+    """Impl do SQLite que aplica FKs explícitas via recriação da tabela (batch)
+
+    O SQLite não tem ALTER TABLE ... ADD/DROP CONSTRAINT, e as revisões já
+    publicadas usam op.create_foreign_key / op.drop_constraint direto. Em vez
+    de reescrevê-las, a cópia-e-troca do modo batch é feita aqui; no Postgres
+    nada muda.
+    """
+    __dialect__ = "sqlite"
+
+    def add_constraint(self, const, **kw):
+        if isinstance(const, ForeignKeyConstraint) and const._create_rule is None:
+            with op.batch_alter_table(const.parent.name, schema=const.parent.schema, recreate="always") as batch_op:
+                batch_op.impl.add_constraint(const)
+            return
+        super().add_constraint(const, **kw)
+
+    def drop_constraint(self, const, **kw):
+        if isinstance(const, ForeignKeyConstraint) and const._create_rule is None:
+            with op.batch_alter_table(const.parent.name, schema=const.parent.schema, recreate="always") as batch_op:
+                batch_op.impl.drop_constraint(const)
+            return
+        super().drop_constraint(const, **kw)
+
+
 def get_url():
     """Obtém a URL do banco de dados das configurações"""
     return settings.DATABASE_URL
@@ -58,6 +87,19 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite não suporta a maioria dos ALTER TABLE: autogenerate em modo batch
+        render_as_batch=connection.dialect.name == "sqlite",
     )
 
     with context.begin_transaction():
@@ -71,6 +113,13 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Conexão fornecida pelo chamador (ex.: SQLite em memória, que só existe
+    # na conexão da aplicação): config.attributes["connection"]
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
     
@@ -81,12 +130,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
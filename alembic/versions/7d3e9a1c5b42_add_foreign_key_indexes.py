@@ -0,0 +1,29 @@
+"""add_foreign_key_indexes
+
+Revision ID: 7d3e9a1c5b42
+Revises: bf249221ddb0
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d3e9a1c5b42'
+down_revision = 'bf249221ddb0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # users.role_id: contagem de usuários por role (delete_role) e join com roles
+    op.create_index(op.f('ix_users_role_id'), 'users', ['role_id'], unique=False)
+    # role_module_permissions.module_id: o índice único (role_id, module_id) não
+    # atende buscas só por módulo (join/cascade a partir de modules)
+    op.create_index(op.f('ix_role_module_permissions_module_id'), 'role_module_permissions', ['module_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_role_module_permissions_module_id'), table_name='role_module_permissions')
+    op.drop_index(op.f('ix_users_role_id'), table_name='users')
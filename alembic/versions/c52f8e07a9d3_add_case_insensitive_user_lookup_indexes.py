@@ -0,0 +1,55 @@
+"""add_case_insensitive_user_lookup_indexes
+
+Revision ID: c52f8e07a9d3
+Revises: 7d3e9a1c5b42
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52f8e07a9d3'
+down_revision = '7d3e9a1c5b42'
+branch_labels = None
+depends_on = None
+
+
+def _case_variant_duplicates(column: str) -> list:
+    """Grupos de usuários cujo `column` só difere em maiúsculas/minúsculas"""
+    bind = op.get_bind()
+    duplicated = sa.text(
+        f"SELECT lower({column}) AS value FROM users "
+        f"GROUP BY lower({column}) HAVING COUNT(*) > 1 ORDER BY lower({column})"
+    )
+    groups = []
+    for value in bind.execute(duplicated).scalars():
+        rows = bind.execute(
+            sa.text(f"SELECT id, {column} FROM users WHERE lower({column}) = :value ORDER BY id"),
+            {"value": value},
+        ).all()
+        groups.append(", ".join(f"id={row[0]} {column}={row[1]!r}" for row in rows))
+    return groups
+
+
+def upgrade() -> None:
+    # Índices funcionais únicos para a busca case-insensitive de login/token.
+    # Antes de criá-los, verifica se já há emails ou usernames que só diferem
+    # em maiúsculas: o CREATE UNIQUE INDEX falharia com um erro pouco claro.
+    conflicts = []
+    for column in ("email", "username"):
+        conflicts += [f"  {column}: {group}" for group in _case_variant_duplicates(column)]
+    if conflicts:
+        raise RuntimeError(
+            "Cannot create case-insensitive unique indexes: these users differ only by case. "
+            "Rename or merge them, then run the migration again.\n" + "\n".join(conflicts)
+        )
+
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=True)
+    op.create_index('ix_users_lower_username', 'users', [sa.text('lower(username)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_lower_username', table_name='users')
+    op.drop_index('ix_users_lower_email', table_name='users')
@@ -0,0 +1,43 @@
+"""sqlite_users_created_at_default
+
+Revision ID: e4b1d6f20a7c
+Revises: c52f8e07a9d3
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b1d6f20a7c'
+down_revision = 'c52f8e07a9d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A revisão inicial usa server_default text('now()'), que só existe no
+    # Postgres: no SQLite todo INSERT sem created_at falharia. O SQLite não
+    # altera defaults com ALTER TABLE, então a tabela é recriada (batch) com
+    # CURRENT_TIMESTAMP. No Postgres nada muda.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # Índices funcionais não sobrevivem à reflexão do batch: recriados depois
+    op.drop_index('ix_users_lower_username', table_name='users')
+    op.drop_index('ix_users_lower_email', table_name='users')
+    with op.batch_alter_table('users', recreate='always') as batch_op:
+        batch_op.alter_column(
+            'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            existing_nullable=False,
+        )
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=True)
+    op.create_index('ix_users_lower_username', 'users', [sa.text('lower(username)')], unique=True)
+
+
+def downgrade() -> None:
+    # Voltar ao default now() só tornaria a tabela inutilizável no SQLite
+    pass
@@ -1,11 +1,12 @@
 from typing import Literal
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.user import User as UserModel
 from app.api.v1.routes.auth import get_current_user
-from app.services.authz_service import enforce_permission
+from app.services.authz_service import enforce_permission, is_super_admin
+from app.core.instrumentation import timed_phase
 
 Action = Literal["read", "create", "update", "delete"]
 
@@ -23,8 +24,21 @@ def require_permission(module_key: str, action: Action):
         current_user: UserModel = Depends(get_current_user),
         db: Session = Depends(get_db),
     ):
-        enforce_permission(db, current_user, module_key, action)
+        with timed_phase("authz"):
+            enforce_permission(db, current_user, module_key, action)
         return current_user
     
     return dependency
 
+
+
+def require_super_admin(
+    current_user: UserModel = Depends(get_current_user),
+) -> UserModel:
+    """Dependência que restringe a rota ao Super Admin (rotas operacionais/diagnóstico)"""
+    if not is_super_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied: super admin only"
+        )
+    return current_user
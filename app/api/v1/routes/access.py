@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, use_read_replica
 from app.models.user import User as UserModel
 from app.api.v1.routes.auth import get_current_user
 from app.api.v1.deps import require_permission
@@ -9,8 +10,10 @@ from app.schemas.role import Role, RoleCreate, RoleUpdate
 from app.schemas.module import Module
 from app.schemas.user import User
 from app.schemas.permission import (
+    RoleModulePermission,
     RolePermissionMatrix,
     PermissionBulkUpdate,
+    PermissionCheckRequest,
     UserRoleUpdate
 )
 from app.schemas.response import GetResponse, ListResponse, CreateResponse, UpdateResponse, DeleteResponse
@@ -21,8 +24,10 @@ from app.core.responses import (
     update_response,
     delete_response,
     error_response,
-    error_detail
+    error_detail,
+    schema_response
 )
+from app.core.includes import IncludeAllowlist
 from app.services.role_service import (
     get_role,
     get_roles,
@@ -36,12 +41,35 @@ from app.services.permission_service import (
     update_role_permissions
 )
 from app.services.user_service import get_user, update_user as update_user_service
-from app.services.authz_service import is_super_admin
+from app.services.authz_service import is_super_admin, check_permissions, enforce_permission
+from app.api.v1.routing import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
+ROLE_INCLUDE_DESCRIPTION = "Relacionamentos a incluir, separados por vírgula: permissions, permissions.module"
 
-@router.get("/modules", response_model=ListResponse[Module])
+ROLE_INCLUDES = IncludeAllowlist(Role, {
+    "permissions": (RoleModulePermission, True),
+    "permissions.module": (Module, False),
+})
+
+
+def _role_response(envelope, includes):
+    """Envelope com o schema completo ou expandido conforme include"""
+    if not includes:
+        return envelope
+    return schema_response(envelope, ROLE_INCLUDES.response_schema(includes))
+
+
+def _invalid_include(exc: ValueError):
+    return error_response(
+        message="Validation error",
+        status_code=status.HTTP_400_BAD_REQUEST,
+        errors=[error_detail(field="include", message=str(exc))]
+    )
+
+
+@router.get("/modules", response_model=ListResponse[Module], dependencies=[Depends(use_read_replica)])
 def list_modules(
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_permission("access_control", "read"))
@@ -57,30 +85,43 @@ def list_modules(
     )
 
 
-@router.get("/roles", response_model=ListResponse[Role])
+@router.get("/roles", response_model=ListResponse[Role], dependencies=[Depends(use_read_replica)])
 def list_roles(
+    include: Optional[str] = Query(None, description=ROLE_INCLUDE_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_permission("access_control", "read"))
 ):
-    """Lista todos os roles"""
-    roles = get_roles(db)
-    return list_response(
+    """Lista todos os roles (com `include`, as permissões vêm na mesma resposta)"""
+    try:
+        includes = ROLE_INCLUDES.parse(include)
+    except ValueError as exc:
+        return _invalid_include(exc)
+    
+    roles = get_roles(db, includes=includes)
+    envelope = list_response(
         items=roles,
         total=len(roles),
         page=1,
         per_page=len(roles),
         message="Roles retrieved successfully"
     )
+    return _role_response(envelope, includes)
 
 
-@router.get("/roles/{role_id}", response_model=GetResponse[Role])
+@router.get("/roles/{role_id}", response_model=GetResponse[Role], dependencies=[Depends(use_read_replica)])
 def get_role_detail(
     role_id: int,
+    include: Optional[str] = Query(None, description=ROLE_INCLUDE_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_permission("access_control", "read"))
 ):
-    """Obtém detalhes de um role específico"""
-    role = get_role(db, role_id)
+    """Obtém detalhes de um role específico (com `include`, as permissões vêm junto)"""
+    try:
+        includes = ROLE_INCLUDES.parse(include)
+    except ValueError as exc:
+        return _invalid_include(exc)
+    
+    role = get_role(db, role_id, includes=includes)
     if not role:
         return error_response(
             message="Role not found",
@@ -88,10 +129,11 @@ def get_role_detail(
             errors=[error_detail(message=f"Role with ID {role_id} not found")]
         )
     
-    return get_response(
+    envelope = get_response(
         data=role,
         message="Role retrieved successfully"
     )
+    return _role_response(envelope, includes)
 
 
 @router.post("/roles", response_model=CreateResponse[Role], status_code=status.HTTP_201_CREATED)
@@ -204,7 +246,7 @@ def delete_role_route(
         )
 
 
-@router.get("/roles/{role_id}/permissions", response_model=GetResponse[RolePermissionMatrix])
+@router.get("/roles/{role_id}/permissions", response_model=GetResponse[RolePermissionMatrix], dependencies=[Depends(use_read_replica)])
 def get_role_permissions(
     role_id: int,
     db: Session = Depends(get_db),
@@ -307,3 +349,31 @@ def update_user_role(
         message="User role updated successfully"
     )
 
+
+
+@router.post("/check", response_model=GetResponse[List[bool]], dependencies=[Depends(use_read_replica)])
+def check_permissions_route(
+    payload: PermissionCheckRequest,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Verifica várias permissões em uma única chamada.
+    
+    Itens sem user_id são avaliados para o usuário atual. Verificar permissões
+    de outros usuários requer "access_control", "read".
+    Retorna uma lista de booleanos na mesma ordem dos itens enviados.
+    """
+    if any(item.user_id not in (None, current_user.id) for item in payload.checks):
+        enforce_permission(db, current_user, "access_control", "read")
+    
+    results = check_permissions(
+        db,
+        current_user,
+        [(item.user_id, item.module_key, item.action) for item in payload.checks]
+    )
+    
+    return get_response(
+        data=results,
+        message="Permissions checked successfully"
+    )
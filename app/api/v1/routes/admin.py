@@ -0,0 +1,228 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.models.user import User as UserModel
+from app.api.v1.deps import require_super_admin
+from app.schemas.response import GetResponse, ListResponse
+from app.core.responses import get_response, list_response, error_response, error_detail
+from app.core.profiler import profile_store
+from app.core import memory
+from app.core.loop_watchdog import loop_watchdog
+from app.db.session import engine, replica_engines, early_releases
+from app.db.pool import pool_stats
+from app.api.v1.routing import InstrumentedRoute
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get("/db/pool", response_model=GetResponse[dict])
+def read_pool_stats(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Estado e métricas do pool de conexões deste worker (apenas Super Admin)"""
+    return get_response(
+        data={
+            "primary": pool_stats(engine, "primary"),
+            "replicas": [
+                pool_stats(replica, f"replica-{index}")
+                for index, replica in enumerate(replica_engines)
+            ],
+            "session_early_releases_total": early_releases.get(),
+        },
+        message="Pool stats retrieved successfully"
+    )
+
+
+def _not_found(message: str, detail: str):
+    return error_response(
+        message=message,
+        status_code=status.HTTP_404_NOT_FOUND,
+        errors=[error_detail(message=detail)]
+    )
+
+
+@router.get("/profiles", response_model=ListResponse[dict])
+def list_profiles(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Lista os perfis de CPU capturados neste worker (mais recentes primeiro)"""
+    profiles = [profile.summary() for profile in profile_store.list()]
+    return list_response(
+        items=profiles,
+        total=len(profiles),
+        page=1,
+        per_page=max(len(profiles), 1),
+        message="Profiles retrieved successfully"
+    )
+
+
+@router.get("/profiles/{profile_id}", response_model=GetResponse[dict])
+def read_profile(
+    profile_id: int,
+    sort: str = "cumulative",
+    limit: int = 50,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Detalhes de um perfil: estatísticas do cProfile e collapsed stacks"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        return _not_found("Profile not found", f"Profile with ID {profile_id} not found on this worker")
+    
+    return get_response(
+        data={
+            **profile.summary(),
+            "cprofile": profile.pstats_text(sort=sort, limit=limit),
+            "collapsed": profile.collapsed_stacks(),
+        },
+        message="Profile retrieved successfully"
+    )
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def read_profile_collapsed(
+    profile_id: int,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Collapsed stacks (entrada para flamegraph.pl / speedscope)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(profile.collapsed_stacks())
+
+
+@router.get("/profiles/{profile_id}/pstats")
+def download_profile_pstats(
+    profile_id: int,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Estatísticas do cProfile em formato binário (.prof, para snakeviz/pstats)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return Response(
+        content=profile.pstats_dump(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'}
+    )
+
+
+@router.get("/memory", response_model=GetResponse[dict])
+def read_memory_status(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Estado do tracemalloc e snapshots disponíveis neste worker"""
+    return get_response(
+        data=memory.tracing_status(),
+        message="Memory tracing status retrieved successfully"
+    )
+
+
+@router.post("/memory/tracing/start", response_model=GetResponse[dict])
+def start_memory_tracing(
+    frames: int = 1,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Liga o rastreamento de alocações (frames = profundidade do traceback guardado)"""
+    return get_response(
+        data=memory.start_tracing(max(1, min(frames, 50))),
+        message="Memory tracing started"
+    )
+
+
+@router.post("/memory/tracing/stop", response_model=GetResponse[dict])
+def stop_memory_tracing(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Desliga o rastreamento de alocações"""
+    return get_response(
+        data=memory.stop_tracing(),
+        message="Memory tracing stopped"
+    )
+
+
+@router.post("/memory/snapshots", response_model=GetResponse[dict], status_code=status.HTTP_201_CREATED)
+def create_memory_snapshot(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Tira um snapshot das alocações rastreadas"""
+    try:
+        snapshot_id = memory.take_snapshot()
+    except ValueError as e:
+        return error_response(
+            message="Validation error",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            errors=[error_detail(message=str(e))]
+        )
+    
+    return get_response(
+        data={"id": snapshot_id},
+        message="Snapshot taken successfully",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.get("/memory/snapshots/{snapshot_id}", response_model=ListResponse[dict])
+def read_memory_snapshot(
+    snapshot_id: int,
+    group_by: memory.GroupBy = "lineno",
+    limit: int = 25,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Maiores consumidores de memória de um snapshot, agrupados por arquivo/linha"""
+    try:
+        top = memory.snapshot_top(snapshot_id, group_by, limit)
+    except ValueError as e:
+        return _not_found("Snapshot not found", str(e))
+    
+    return list_response(
+        items=top,
+        total=len(top),
+        page=1,
+        per_page=max(len(top), 1),
+        message="Snapshot statistics retrieved successfully"
+    )
+
+
+@router.get("/memory/diff", response_model=ListResponse[dict])
+def diff_memory_snapshots(
+    base: int,
+    target: int,
+    group_by: memory.GroupBy = "lineno",
+    limit: int = 25,
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Compara dois snapshots (crescimento de memória entre base e target)"""
+    try:
+        diff = memory.snapshot_diff(base, target, group_by, limit)
+    except ValueError as e:
+        return _not_found("Snapshot not found", str(e))
+    
+    return list_response(
+        items=diff,
+        total=len(diff),
+        page=1,
+        per_page=max(len(diff), 1),
+        message="Snapshot diff retrieved successfully"
+    )
+
+
+@router.get("/memory/objects", response_model=GetResponse[dict])
+def read_live_objects(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Contagem de instâncias vivas de models ORM e envelopes de resposta (percorre o heap)"""
+    return get_response(
+        data=memory.live_object_counts(),
+        message="Live object counts retrieved successfully"
+    )
+
+
+@router.get("/event-loop", response_model=GetResponse[dict])
+def read_event_loop_status(
+    current_user: UserModel = Depends(require_super_admin)
+):
+    """Lag do event loop e bloqueios recentes (rota e stack de quem bloqueou)"""
+    return get_response(
+        data=loop_watchdog.status(),
+        message="Event loop status retrieved successfully"
+    )
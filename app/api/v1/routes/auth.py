@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, use_read_replica
+from app.db.loaders import get_loaders
 from app.schemas.auth import Token, LoginRequest
 from app.schemas.user import User
 from app.schemas.response import GetResponse
@@ -12,13 +13,15 @@ from app.services.user_service import authenticate_user
 from app.core.security import create_access_token, decode_access_token
 from app.core.config import settings
 from app.core.responses import get_response
+from app.core.instrumentation import current_request_stats, timed_phase
+from app.api.v1.routing import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> UserModel:
@@ -29,7 +32,8 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    with timed_phase("token"):
+        payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
     
@@ -38,16 +42,21 @@ async def get_current_user(
         raise credentials_exception
     
     from app.services.user_service import get_user_by_email_or_username
-    from sqlalchemy.orm import joinedload
-    user = db.query(UserModel).options(
-        joinedload(UserModel.role)
-    ).filter(
-        (UserModel.email == username) | (UserModel.username == username)
-    ).first()
+    with timed_phase("user"):
+        user = get_user_by_email_or_username(db, username, with_role=True)
     
     if user is None:
         raise credentials_exception
     
+    # Buscas seguintes do usuário/role no mesmo request saem do cache
+    get_loaders(db).prime_user(user)
+    
+    # Diagnósticos sob demanda (Server-Timing, profiler) só valem para Super Admin
+    stats = current_request_stats.get()
+    if stats is not None:
+        from app.services.authz_service import is_super_admin
+        stats.is_admin = is_super_admin(user)
+    
     # Verificar se usuário tem permissão para acessar o sistema
     if not user.can_access_system or not user.is_active:
         raise HTTPException(
@@ -59,7 +68,7 @@ async def get_current_user(
 
 
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
@@ -97,7 +106,7 @@ async def login(
 
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(
+def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
@@ -134,8 +143,8 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.get("/me", response_model=GetResponse[User])
-async def read_users_me(current_user: UserModel = Depends(get_current_user)):
+@router.get("/me", response_model=GetResponse[User], dependencies=[Depends(use_read_replica)])
+def read_users_me(current_user: UserModel = Depends(get_current_user)):
     """Retorna informações do usuário atual"""
     return get_response(
         data=current_user,
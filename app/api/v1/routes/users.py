@@ -1,31 +1,89 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.schemas.user import User, UserCreate, UserUpdate
+from app.db.session import get_db, use_read_replica
+from app.schemas.user import User, UserBatchGetRequest, UserBatchGetResult, UserCreate, UserUpdate
+from app.schemas.role import Role
+from app.schemas.permission import RoleModulePermission
 from app.schemas.response import CreateResponse, GetResponse, ListResponse, UpdateResponse
 from app.core.pagination import PaginationParams
+from app.core.fields import parse_fields, partial_schema, sparse_schema
+from app.core.includes import IncludeAllowlist
 from app.core.responses import (
     create_response,
     get_response,
     list_response,
     update_response,
     error_response,
-    error_detail
+    error_detail,
+    schema_response
 )
 from app.services.user_service import (
     get_user,
     get_users,
+    get_users_by_ids,
     create_user,
     update_user,
     get_user_by_email,
     get_user_by_username,
 )
+from app.services.authz_service import enforce_permission
 from app.api.v1.routes.auth import get_current_user
 from app.models.user import User as UserModel
+from app.api.v1.routing import InstrumentedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
+
+FIELDS_DESCRIPTION = "Campos do usuário a retornar, separados por vírgula (ex.: id,username,email)"
+INCLUDE_DESCRIPTION = (
+    "Relacionamentos a incluir, separados por vírgula: role, role.permissions "
+    "(role.permissions exige access_control:read)"
+)
+
+USER_INCLUDES = IncludeAllowlist(
+    User,
+    {
+        "role": (Role, False),
+        "role.permissions": (RoleModulePermission, True),
+    },
+    # A matriz de permissões é protegida em /access/roles
+    permissions={"role.permissions": ("access_control", "read")},
+)
+
+
+def _invalid_param(param: str, exc: ValueError):
+    return error_response(
+        message="Validation error",
+        status_code=status.HTTP_400_BAD_REQUEST,
+        errors=[error_detail(field=param, message=str(exc))]
+    )
+
+
+# Documentação das respostas com fields/include: essas respostas são geradas
+# por schema_response (fora do response_model), com só os campos pedidos e os
+# relacionamentos incluídos
+USER_SPARSE_SCHEMA = partial_schema(USER_INCLUDES.response_schema(tuple(USER_INCLUDES.relations)))
+SPARSE_RESPONSE_DESCRIPTION = (
+    "Com `fields`, cada usuário traz só os campos pedidos; com `include`, "
+    "traz também os relacionamentos pedidos"
+)
+
+
+def _enforce_include_permissions(db: Session, current_user: UserModel, includes) -> None:
+    """403 se o usuário não puder ver algum dos relacionamentos pedidos"""
+    for module_key, action in sorted(USER_INCLUDES.required_permissions(includes)):
+        enforce_permission(db, current_user, module_key, action)
+
+
+def _user_response(envelope, selected_fields, includes):
+    """Envelope com o schema completo ou reduzido/expandido conforme fields/include"""
+    if not selected_fields and not includes:
+        return envelope
+    item_schema = USER_INCLUDES.response_schema(includes)
+    if selected_fields:
+        item_schema = sparse_schema(item_schema, selected_fields + USER_INCLUDES.roots(includes))
+    return schema_response(envelope, item_schema)
 
 
 @router.post("/", response_model=CreateResponse[User], status_code=status.HTTP_201_CREATED)
@@ -60,42 +118,105 @@ def create_user_route(
     )
 
 
-@router.get("/", response_model=ListResponse[User])
+@router.get(
+    "/",
+    response_model=ListResponse[User],
+    dependencies=[Depends(use_read_replica)],
+    responses={200: {"model": ListResponse[USER_SPARSE_SCHEMA], "description": SPARSE_RESPONSE_DESCRIPTION}},
+)
 def read_users(
     pagination: PaginationParams = Depends(),
     email: Optional[str] = None,
     username: Optional[str] = None,
     is_active: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    """Lista todos os usuários com paginação e filtros (requer autenticação)"""
+    """
+    Lista todos os usuários com paginação e filtros (requer autenticação).
+    
+    Com `fields`, só as colunas pedidas são carregadas e serializadas. Com
+    `include`, os relacionamentos vêm na mesma resposta, com um número fixo
+    de queries independente do tamanho da página.
+    """
+    try:
+        selected_fields = parse_fields(fields, User)
+    except ValueError as exc:
+        return _invalid_param("fields", exc)
+    try:
+        includes = USER_INCLUDES.parse(include)
+    except ValueError as exc:
+        return _invalid_param("include", exc)
+    _enforce_include_permissions(db, current_user, includes)
+    
     users, total = get_users(
         db,
         page=pagination.page,
         per_page=pagination.perPage,
         email=email,
         username=username,
-        is_active=is_active
+        is_active=is_active,
+        fields=selected_fields,
+        includes=includes
     )
     
-    return list_response(
+    envelope = list_response(
         items=users,
         total=total,
         page=pagination.page,
         per_page=pagination.perPage,
         message="Users retrieved successfully"
     )
+    return _user_response(envelope, selected_fields, includes)
 
 
-@router.get("/{user_id}", response_model=GetResponse[User])
+@router.post("/batch-get", response_model=GetResponse[UserBatchGetResult], dependencies=[Depends(use_read_replica)])
+def batch_get_users(
+    payload: UserBatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Busca vários usuários por ID em uma única chamada (requer autenticação).
+    
+    Substitui N chamadas a GET /users/{id}: os usuários voltam na ordem dos
+    ids enviados e os ids inexistentes são listados em missing_ids.
+    """
+    users, missing_ids = get_users_by_ids(db, payload.ids)
+    
+    return get_response(
+        data={"users": users, "missing_ids": missing_ids},
+        message="Users retrieved successfully"
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=GetResponse[User],
+    dependencies=[Depends(use_read_replica)],
+    responses={200: {"model": GetResponse[USER_SPARSE_SCHEMA], "description": SPARSE_RESPONSE_DESCRIPTION}},
+)
 def read_user(
     user_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    """Busca um usuário por ID (requer autenticação)"""
-    db_user = get_user(db, user_id=user_id)
+    """Busca um usuário por ID (requer autenticação); aceita `fields` e `include` como a listagem"""
+    try:
+        selected_fields = parse_fields(fields, User)
+    except ValueError as exc:
+        return _invalid_param("fields", exc)
+    try:
+        includes = USER_INCLUDES.parse(include)
+    except ValueError as exc:
+        return _invalid_param("include", exc)
+    _enforce_include_permissions(db, current_user, includes)
+    
+    db_user = get_user(db, user_id=user_id, includes=includes, fields=selected_fields)
     if db_user is None:
         return error_response(
             message="User not found",
@@ -103,10 +224,11 @@ def read_user(
             errors=[error_detail(message=f"User with ID {user_id} not found")]
         )
     
-    return get_response(
+    envelope = get_response(
         data=db_user,
         message="User retrieved successfully"
     )
+    return _user_response(envelope, selected_fields, includes)
 
 
 @router.put("/{user_id}", response_model=UpdateResponse[User])
@@ -0,0 +1,97 @@
+"""
+Classe de rota da API.
+
+- Mede o tempo do handler e da validação do response_model (fases do
+  Server-Timing) e liga o cProfile no handler de requests perfilados.
+- Com DB_SESSION_EARLY_RELEASE ativo, a sessão do banco recebida pelo handler é
+  liberada assim que ele retorna, antes da validação do response_model e do
+  encoding JSON. Assim a conexão não fica presa ao pool durante a serialização
+  de payloads grandes (ex.: ListResponse).
+"""
+import functools
+import inspect
+import time
+from typing import Callable
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.instrumentation import current_request_stats
+from app.db.session import release_connection
+
+
+def _release_sessions(kwargs: dict) -> None:
+    for value in kwargs.values():
+        if isinstance(value, Session):
+            release_connection(value)
+
+
+def _finish_handler(start: float, kwargs: dict, release_db: bool) -> None:
+    if release_db:
+        _release_sessions(kwargs)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.handler_end = time.perf_counter()
+        stats.add_phase("handler", stats.handler_end - start)
+
+
+def _start_handler():
+    """Marca o início do handler e liga o cProfile se o request estiver sendo perfilado"""
+    stats = current_request_stats.get()
+    profile = stats.profile if stats is not None else None
+    if profile is not None:
+        profile.profile_handler_thread()
+        profile.cprofile.enable()
+    return time.perf_counter(), profile
+
+
+def wrap_endpoint(endpoint: Callable, release_db: bool = False) -> Callable:
+    """Envolve o endpoint para medir/perfilar o handler e (opcionalmente) liberar as sessões recebidas"""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            start, profile = _start_handler()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile.cprofile.disable()
+                _finish_handler(start, kwargs, release_db)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        start, profile = _start_handler()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.cprofile.disable()
+            _finish_handler(start, kwargs, release_db)
+
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute com medição de fases e liberação antecipada da sessão (quando configurada)"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        endpoint = wrap_endpoint(endpoint, release_db=settings.DB_SESSION_EARLY_RELEASE)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def instrumented_route_handler(request: Request):
+            response = await route_handler(request)
+            stats = current_request_stats.get()
+            if stats is not None and stats.handler_end is not None:
+                # Tudo entre o fim do handler e a resposta pronta, exceto o encoding JSON
+                serialize = time.perf_counter() - stats.handler_end
+                stats.add_phase("validate", max(serialize - stats.phases.get("encode", 0.0), 0.0))
+            return response
+
+        return instrumented_route_handler
@@ -1,7 +1,7 @@
 import os
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -16,11 +16,72 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Database - Réplicas de leitura (opcional)
+    # DB_REPLICA_STRATEGY: "round_robin" ou "least_connections"
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    
+    # Database - Pool de conexões
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1  # segundos; -1 desabilita
+    DB_POOL_USE_LIFO: bool = False
+    # Liveness: pool_pre_ping pinga a cada checkout (1 round-trip por request).
+    # Com ele desligado, só conexões ociosas há mais de DB_POOL_PING_IDLE_SECONDS
+    # são pingadas (valor negativo desabilita o ping por ociosidade).
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_PING_IDLE_SECONDS: float = 30.0
+    
+    # Database - Logs
+    # DB_ECHO loga todo statement (síncrono; só para depuração local).
+    # Queries acima de SLOW_QUERY_THRESHOLD_MS são logadas (negativo desabilita) e
+    # uma fração SLOW_QUERY_EXPLAIN_SAMPLE_RATE delas tem o EXPLAIN capturado (Postgres)
+    DB_ECHO: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0
+    
+    # Database - Sessão
+    # Devolve a conexão ao pool assim que o handler da rota termina, antes da
+    # validação/serialização da resposta (usa expire_on_commit=False)
+    DB_SESSION_EARLY_RELEASE: bool = False
+    
+    # Database - Perfil SQLite (DATABASE_URL=sqlite:///./data/app.db ou sqlite:// em memória)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: float = 5000.0
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    
     # Security
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     
+    # Observabilidade
+    METRICS_ENABLED: bool = True
+    # GET /metrics exige "Authorization: Bearer <token>"; sem token, só clientes locais
+    METRICS_TOKEN: Optional[str] = None
+    # Máximo de statements SQL por request antes de logar um warning (0 desabilita)
+    SQL_QUERY_BUDGET: int = 20
+    # Expõe X-DB-Query-Count fora do modo debug
+    SQL_QUERY_COUNT_HEADER: bool = False
+    # Header Server-Timing em todas as respostas (Super Admin pode pedir via X-Server-Timing)
+    SERVER_TIMING_ENABLED: bool = False
+    # Profiler por request: header X-Profile (Super Admin) ou amostragem
+    PROFILER_ENABLED: bool = False
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_STORED: int = 20
+    # Detector de bloqueio do event loop
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_MS: float = 100.0
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0
+    # Captura amostrada de tráfego real (para replay), segredos mascarados
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 0.01
+    TRAFFIC_CAPTURE_PATH: str = "traffic/capture.jsonl"
+    TRAFFIC_CAPTURE_MAX_BODY_BYTES: int = 16384
+    
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
     
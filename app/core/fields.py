@@ -0,0 +1,69 @@
+"""
+Sparse fieldsets (`?fields=id,username,email`).
+
+- parse_fields: valida os campos pedidos contra o schema de resposta;
+- sparse_schema: schema reduzido aos campos pedidos (cacheado por conjunto
+  de campos, na ordem do schema original);
+- load_only_fields: opção load_only do SQLAlchemy para carregar só as colunas
+  correspondentes;
+- partial_schema: o schema com todos os campos opcionais, para documentar no
+  OpenAPI as respostas com `fields`.
+
+A resposta com o schema reduzido é gerada por app.core.responses.schema_response.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Converte "a,b,c" nos campos do schema, na ordem em que ele os declara.
+
+    Returns:
+        None se nenhum campo foi pedido (resposta completa)
+
+    Raises:
+        ValueError: campo inexistente no schema
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(schema.model_fields)}"
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def sparse_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Schema com apenas `fields` (mesmos tipos e validações do original)"""
+    return create_model(
+        f"{schema.__name__}[{','.join(fields)}]",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+
+
+def load_only_fields(model, fields: Tuple[str, ...]):
+    """load_only com as colunas do model que correspondem aos campos (a PK é sempre carregada)"""
+    columns = inspect(model).column_attrs
+    return load_only(*(getattr(model, name) for name in fields if name in columns))
+
+
+@lru_cache(maxsize=64)
+def partial_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Schema com todos os campos opcionais (cada um só aparece se pedido em `fields`)"""
+    return create_model(
+        f"{schema.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (Optional[field.annotation], None) for name, field in schema.model_fields.items()},
+    )
@@ -0,0 +1,104 @@
+"""
+Expansão de relacionamentos (`?include=role,role.permissions`).
+
+- IncludeAllowlist: includes permitidos de um recurso (caminho -> schema do
+  relacionamento), validação do parâmetro, permissões exigidas por include
+  e schema de resposta expandido (cacheado por conjunto de includes);
+- eager_load_options: opções de eager loading do SQLAlchemy para os includes,
+  a partir dos `relationship` dos models: joinedload para relacionamentos
+  to-one e selectinload para to-many. O número de queries não depende do
+  tamanho da página.
+"""
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, create_model
+from sqlalchemy.orm import joinedload, selectinload
+
+
+class IncludeAllowlist:
+    """Includes permitidos de um recurso: caminho -> (schema do relacionamento, é lista)"""
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        relations: Dict[str, Tuple[Type[BaseModel], bool]],
+        permissions: Optional[Dict[str, Tuple[str, str]]] = None
+    ):
+        self.schema = schema
+        self.relations = relations
+        # Caminho -> (módulo, ação) exigidos para expandir o include. Um include
+        # não pode expor dados que a rota dona deles protege com permissão.
+        self.permissions = permissions or {}
+        self._schemas: Dict[Tuple[str, ...], Type[BaseModel]] = {}
+
+    def parse(self, include: Optional[str]) -> Tuple[str, ...]:
+        """
+        Converte "a,b.c" nos includes pedidos, acrescentando os caminhos pais
+        (b.c implica b), na ordem da allowlist.
+
+        Raises:
+            ValueError: include fora da allowlist
+        """
+        if not include:
+            return ()
+        requested = {path.strip() for path in include.split(",") if path.strip()}
+        unknown = requested - set(self.relations)
+        if unknown:
+            raise ValueError(
+                f"Unknown include(s): {', '.join(sorted(unknown))}. "
+                f"Allowed: {', '.join(self.relations)}"
+            )
+        for path in list(requested):
+            parts = path.split(".")
+            requested.update(".".join(parts[:size]) for size in range(1, len(parts)))
+        return tuple(path for path in self.relations if path in requested)
+
+    def required_permissions(self, includes: Tuple[str, ...]) -> Set[Tuple[str, str]]:
+        """Permissões (módulo, ação) exigidas pelos includes pedidos"""
+        return {self.permissions[path] for path in includes if path in self.permissions}
+
+    @staticmethod
+    def roots(includes: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Campos de primeiro nível acrescentados à resposta pelos includes"""
+        return tuple(path for path in includes if "." not in path)
+
+    def response_schema(self, includes: Tuple[str, ...]) -> Type[BaseModel]:
+        """Schema do recurso com os relacionamentos incluídos (cacheado)"""
+        if not includes:
+            return self.schema
+        schema = self._schemas.get(includes)
+        if schema is None:
+            schema = self._schemas[includes] = self._expand(self.schema, includes, "")
+        return schema
+
+    def _expand(self, schema: Type[BaseModel], includes: Tuple[str, ...], prefix: str) -> Type[BaseModel]:
+        fields = {}
+        for path in includes:
+            name = path[len(prefix):]
+            if not path.startswith(prefix) or "." in name:
+                continue
+            relation_schema, many = self.relations[path]
+            nested = self._expand(relation_schema, includes, f"{path}.")
+            fields[name] = (List[nested], []) if many else (Optional[nested], None)
+        if not fields:
+            return schema
+        return create_model(f"{schema.__name__}[include={','.join(fields)}]", __base__=schema, **fields)
+
+
+def eager_load_options(model, includes: Tuple[str, ...]) -> list:
+    """Uma opção de eager loading por caminho folha (os pais vêm encadeados)"""
+    leaves = [
+        path for path in includes
+        if not any(other.startswith(f"{path}.") for other in includes)
+    ]
+    options = []
+    for path in leaves:
+        option = None
+        current = model
+        for name in path.split("."):
+            attribute = getattr(current, name)
+            strategy = selectinload if attribute.property.uselist else joinedload
+            option = strategy(attribute) if option is None else getattr(option, strategy.__name__)(attribute)
+            current = attribute.property.mapper.class_
+        options.append(option)
+    return options
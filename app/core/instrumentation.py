@@ -0,0 +1,226 @@
+"""
+Instrumentação por request.
+
+Cada request recebe um RequestStats (via ContextVar) que acumula o número de
+statements SQL, o tempo gasto no banco e o tempo de bcrypt. Os handlers
+síncronos rodam no threadpool com uma cópia do contexto, então o objeto
+mutável continua sendo o mesmo do middleware.
+"""
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Mount, compile_path
+
+from app.core.metrics import REGISTRY
+
+STATEMENT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+db_statements_total = REGISTRY.counter(
+    "db_statements_total", "Statements SQL executados"
+)
+db_statement_seconds = REGISTRY.histogram(
+    "db_statement_seconds", "Duração dos statements SQL"
+)
+bcrypt_seconds = REGISTRY.histogram(
+    "bcrypt_seconds", "Tempo gasto em bcrypt", ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+)
+
+
+def _route_templates(routes: Iterable[Any], prefix: str = "") -> Iterator[Tuple[Any, str]]:
+    """(rota, template completo) de todas as rotas, descendo em routers incluídos e mounts"""
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            # FastAPI recente: o router incluído não é copiado; o prefixo fica no include
+            yield from _route_templates(included.routes, prefix + route.include_context.prefix)
+        elif isinstance(route, Mount):
+            yield from _route_templates(route.routes, prefix + route.path)
+        else:
+            path = getattr(route, "path_format", None) or getattr(route, "path", None)
+            if path is not None:
+                yield route, prefix + path
+
+
+# id do router da aplicação -> (router, quantidade de rotas, id da rota -> templates completos)
+_route_template_cache: Dict[int, Tuple[Any, int, Dict[int, List[str]]]] = {}
+
+
+def _templates_by_route(router: Any) -> Dict[int, List[str]]:
+    cached = _route_template_cache.get(id(router))
+    if cached is not None and cached[0] is router and cached[1] == len(router.routes):
+        return cached[2]
+    templates: Dict[int, List[str]] = {}
+    for route, template in _route_templates(router.routes):
+        templates.setdefault(id(route), []).append(template)
+    _route_template_cache[id(router)] = (router, len(router.routes), templates)
+    return templates
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """
+    Template completo da rota (ex.: /api/v1/users/{user_id}) ou "unmatched".
+
+    `scope["route"].path_format` é relativo ao router em que a rota foi
+    declarada (/{user_id} serve para users, roles e módulos), então o prefixo
+    vem da tabela de rotas da aplicação. Um router incluído em mais de um
+    prefixo é desambiguado pelo path do request.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    relative = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+    router = scope.get("router") or getattr(scope.get("app"), "router", None)
+    if router is None or not hasattr(router, "routes"):
+        return relative
+    templates = _templates_by_route(router).get(id(route))
+    if not templates:
+        return relative
+    if len(templates) > 1:
+        path = scope.get("path", "")
+        for template in templates:
+            if compile_path(template)[0].match(path):
+                return template
+    return templates[0]
+
+
+class RequestStats:
+    """Estatísticas acumuladas durante um request"""
+
+    __slots__ = (
+        "db_statements", "db_seconds", "bcrypt_seconds", "statements",
+        "phases", "handler_end", "server_timing_requested", "is_admin", "scope",
+        "profile",
+    )
+
+    def __init__(self, scope: Optional[Dict[str, Any]] = None):
+        # Scope ASGI do request (para identificar a rota)
+        self.scope = scope
+        self.db_statements = 0
+        self.db_seconds = 0.0
+        self.bcrypt_seconds = 0.0
+        # SQL (já parametrizado pelo SQLAlchemy) -> execuções no request
+        self.statements: Dict[str, int] = {}
+        # Fases do request (nome -> segundos), na ordem em que ocorreram
+        self.phases: Dict[str, float] = {}
+        self.handler_end: Optional[float] = None
+        # Server-Timing pedido via header (só atendido para Super Admin)
+        self.server_timing_requested = False
+        # Usuário autenticado é Super Admin (libera diagnósticos sob demanda)
+        self.is_admin = False
+        # RequestProfile ativo (profiler sob demanda)
+        self.profile = None
+
+    @property
+    def route(self) -> Optional[str]:
+        if self.scope is None:
+            return None
+        return f"{self.scope.get('method')} {route_label(self.scope)}"
+
+    def add_phase(self, name: str, elapsed: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Valor do header Server-Timing (durações em milissegundos)"""
+        entries = [(name, elapsed) for name, elapsed in self.phases.items()]
+        entries.append(("db", self.db_seconds))
+        if self.bcrypt_seconds:
+            entries.append(("bcrypt", self.bcrypt_seconds))
+        if total is not None:
+            entries.append(("total", total))
+        return ", ".join(f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in entries)
+
+    def repeated_statements(self, min_count: int = 2) -> List[Tuple[str, int]]:
+        """Fingerprints executados ao menos `min_count` vezes, do mais repetido ao menos"""
+        fingerprints: Dict[str, int] = {}
+        for statement, count in self.statements.items():
+            fingerprint = sql_fingerprint(statement)
+            fingerprints[fingerprint] = fingerprints.get(fingerprint, 0) + count
+        repeated = [item for item in fingerprints.items() if item[1] >= min_count]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """
+    Conta os statements executados dentro do bloco.
+    
+    Uso (ex.: em testes):
+        with count_queries() as stats:
+            get_users(db)
+        assert stats.db_statements == 2
+    """
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_request_stats.reset(token)
+
+
+@contextmanager
+def timed_phase(name: str) -> Iterator[None]:
+    """Mede um trecho do request e registra como fase do Server-Timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.add_phase(name, time.perf_counter() - start)
+
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:[^()]*)\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def sql_fingerprint(statement: str) -> str:
+    """Normaliza um SQL (literais, listas IN e espaços) para agrupar statements iguais"""
+    fingerprint = _LITERAL_RE.sub("?", statement)
+    fingerprint = _IN_LIST_RE.sub("IN (...)", fingerprint)
+    return _WHITESPACE_RE.sub(" ", fingerprint).strip()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra listeners que contam statements e medem o tempo no banco"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        db_statements_total.inc()
+        db_statement_seconds.observe(elapsed)
+
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.db_statements += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        start_times = context.connection.info.get("query_start_time") if context.connection else None
+        if start_times:
+            start_times.pop()
+
+
+def record_bcrypt(operation: str, elapsed: float) -> None:
+    """Registra o tempo de uma operação de bcrypt"""
+    bcrypt_seconds.observe(elapsed, operation=operation)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.bcrypt_seconds += elapsed
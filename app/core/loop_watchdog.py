@@ -0,0 +1,147 @@
+"""
+Detector de bloqueio do event loop.
+
+Uma task de heartbeat dorme `interval` no loop e mede o atraso com que acorda
+(lag). Uma thread watchdog acompanha o último heartbeat: se o loop ficar sem
+responder além do limite, captura a stack da thread do loop enquanto o
+bloqueio ainda está acontecendo, identificando a rota e a função (rota,
+dependência, bcrypt, I/O síncrono...) que estava rodando.
+
+Quando o heartbeat volta, o bloqueio é registrado com a duração total em
+métricas, log (warning) e na lista de bloqueios recentes (/admin/event-loop).
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional
+
+from app.core.config import settings
+from app.core.instrumentation import route_label
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MIDDLEWARE_FILE = os.path.join(_APP_DIR, "core", "middleware.py")
+
+event_loop_lag_seconds = REGISTRY.histogram(
+    "event_loop_lag_seconds", "Atraso do event loop medido pelo heartbeat",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+event_loop_blocks_total = REGISTRY.counter(
+    "event_loop_blocks_total", "Bloqueios do event loop acima do limite", ["route"]
+)
+
+
+class LoopWatchdog:
+    """Mede o lag do event loop e identifica quem o bloqueou"""
+
+    def __init__(self, interval: float, threshold: float, max_blocks: int = 50):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocks: Deque[dict] = deque(maxlen=max_blocks)
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._pending: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self.running = False
+
+    def start(self) -> None:
+        """Inicia o heartbeat (no loop atual) e a thread watchdog"""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._thread.start()
+        self.running = True
+
+    async def stop(self) -> None:
+        self.running = False
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(now - start - self.interval, 0.0)
+            self._last_beat = now
+            event_loop_lag_seconds.observe(lag)
+            if lag >= self.threshold:
+                self._record_block(lag)
+
+    def _watch(self) -> None:
+        check_every = max(self.threshold / 2, 0.005)
+        while not self._stop_event.wait(check_every):
+            stalled = time.perf_counter() - self._last_beat - self.interval
+            if stalled < self.threshold:
+                continue
+            with self._lock:
+                if self._pending is None:
+                    self._pending = self._capture()
+
+    def _capture(self) -> dict:
+        """Captura, de fora, o que a thread do loop está executando"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack: List[str] = []
+        route = "unknown"
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(_APP_DIR):
+                stack.append(f"{code.co_name} ({os.path.relpath(code.co_filename, os.path.dirname(_APP_DIR))}:{frame.f_lineno})")
+            if code.co_filename == _MIDDLEWARE_FILE and route == "unknown":
+                scope = frame.f_locals.get("scope")
+                if isinstance(scope, dict):
+                    route = f"{scope.get('method')} {route_label(scope)}"
+            frame = frame.f_back
+        return {"route": route, "stack": list(reversed(stack))}
+
+    def _record_block(self, duration: float) -> None:
+        with self._lock:
+            captured, self._pending = self._pending, None
+        captured = captured or {"route": "unknown", "stack": []}
+        block = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            **captured,
+        }
+        self.blocks.append(block)
+        event_loop_blocks_total.inc(route=captured["route"])
+        logger.warning(
+            "Event loop blocked for %.1fms (route=%s) at: %s",
+            duration * 1000,
+            captured["route"],
+            " -> ".join(captured["stack"][-5:]) or "unknown",
+        )
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag": event_loop_lag_seconds.snapshot().get("_"),
+            "recent_blocks": list(reversed(self.blocks)),
+        }
+
+
+# Iniciado no lifespan da aplicação quando LOOP_WATCHDOG_ENABLED
+loop_watchdog = LoopWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+    threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+)
@@ -0,0 +1,150 @@
+"""
+Diagnóstico de memória baseado em tracemalloc.
+
+Permite ligar/desligar o rastreamento de alocações, tirar snapshots, comparar
+dois snapshots agrupando por arquivo/linha e contar instâncias vivas de models
+ORM e envelopes de resposta. Tudo é por worker e só deve ser usado por admins:
+com o tracing ligado o consumo de CPU e memória do processo aumenta.
+"""
+import gc
+import itertools
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Literal, Optional, Tuple
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+# Snapshots guardados por worker (os mais antigos são descartados)
+MAX_SNAPSHOTS = 10
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_snapshots: "OrderedDict[int, Tuple[datetime, tracemalloc.Snapshot]]" = OrderedDict()
+_snapshot_ids = itertools.count(1)
+_lock = threading.Lock()
+
+
+def tracing_status() -> dict:
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": tracemalloc.is_tracing(),
+        "traceback_limit": tracemalloc.get_traceback_limit(),
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        "snapshots": [
+            {"id": snapshot_id, "taken_at": taken_at.isoformat()}
+            for snapshot_id, (taken_at, _) in _snapshots.items()
+        ],
+    }
+
+
+def start_tracing(frames: int = 1) -> dict:
+    """Liga o tracemalloc guardando `frames` frames por alocação"""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    tracemalloc.start(frames)
+    return tracing_status()
+
+
+def stop_tracing() -> dict:
+    """Desliga o tracemalloc (snapshots já tirados continuam disponíveis)"""
+    tracemalloc.stop()
+    return tracing_status()
+
+
+def take_snapshot() -> int:
+    """Tira um snapshot e retorna seu id"""
+    if not tracemalloc.is_tracing():
+        raise ValueError("Tracing is not running")
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    with _lock:
+        snapshot_id = next(_snapshot_ids)
+        _snapshots[snapshot_id] = (datetime.now(timezone.utc), snapshot)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return snapshot_id
+
+
+def _get_snapshot(snapshot_id: int) -> tracemalloc.Snapshot:
+    entry = _snapshots.get(snapshot_id)
+    if entry is None:
+        raise ValueError(f"Snapshot with ID {snapshot_id} not found")
+    return entry[1]
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> List[str]:
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+def snapshot_top(snapshot_id: int, group_by: GroupBy = "lineno", limit: int = 25) -> List[Dict]:
+    """Maiores consumidores de memória de um snapshot"""
+    stats = _get_snapshot(snapshot_id).statistics(group_by)
+    return [
+        {
+            "location": _format_traceback(stat.traceback),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def snapshot_diff(
+    base_id: int,
+    target_id: int,
+    group_by: GroupBy = "lineno",
+    limit: int = 25
+) -> List[Dict]:
+    """Diferença entre dois snapshots (maiores crescimentos primeiro)"""
+    stats = _get_snapshot(target_id).compare_to(_get_snapshot(base_id), group_by)
+    return [
+        {
+            "location": _format_traceback(stat.traceback),
+            "size_bytes": stat.size,
+            "size_diff_bytes": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def live_object_counts(extra_types: Optional[Dict[str, type]] = None) -> Dict[str, int]:
+    """
+    Conta instâncias vivas (rastreadas pelo GC) de models ORM e envelopes de resposta.
+
+    Percorre todos os objetos do processo: custo proporcional ao heap.
+    """
+    from app.models import User, Role, Module, RoleModulePermission
+    from app.schemas.response import BaseResponse, MetaPagination, ErrorDetail
+
+    tracked: Dict[str, type] = {
+        "User": User,
+        "Role": Role,
+        "Module": Module,
+        "RoleModulePermission": RoleModulePermission,
+        "BaseResponse (envelopes)": BaseResponse,
+        "MetaPagination": MetaPagination,
+        "ErrorDetail": ErrorDetail,
+    }
+    if extra_types:
+        tracked.update(extra_types)
+
+    counts = {name: 0 for name in tracked}
+    items = list(tracked.items())
+    objects = gc.get_objects()
+    for obj in objects:
+        for name, cls in items:
+            if isinstance(obj, cls):
+                counts[name] += 1
+    counts["gc_tracked_objects"] = len(objects)
+    del objects
+    return counts
@@ -0,0 +1,145 @@
+"""
+Middlewares ASGI de observabilidade.
+"""
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+from app.core.instrumentation import (
+    RequestStats,
+    STATEMENT_BUCKETS,
+    current_request_stats,
+    route_label,
+)
+from app.core.metrics import REGISTRY
+
+# Métodos fora desta lista são agrupados em "OTHER" (cardinalidade limitada)
+logger = logging.getLogger(__name__)
+
+KNOWN_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+http_requests_total = REGISTRY.counter(
+    "http_requests_total", "Requests HTTP atendidos", ["method", "route", "status"]
+)
+http_request_duration_seconds = REGISTRY.histogram(
+    "http_request_duration_seconds", "Latência dos requests HTTP", ["method", "route"]
+)
+http_requests_in_progress = REGISTRY.gauge(
+    "http_requests_in_progress", "Requests HTTP em andamento", ["method"]
+)
+http_request_db_statements = REGISTRY.histogram(
+    "http_request_db_statements", "Statements SQL por request", ["route"],
+    buckets=STATEMENT_BUCKETS
+)
+http_request_db_seconds = REGISTRY.histogram(
+    "http_request_db_seconds", "Tempo de banco por request", ["route"]
+)
+
+
+class RequestStatsMiddleware:
+    """
+    Cria o RequestStats do request e aplica o orçamento de queries.
+    
+    - Em modo debug (ou com SQL_QUERY_COUNT_HEADER) devolve o header
+      X-DB-Query-Count com o número de statements executados.
+    - Quando a rota ultrapassa SQL_QUERY_BUDGET statements, registra um warning
+      com os fingerprints SQL repetidos (sinal típico de N+1).
+    - Adiciona o header Server-Timing com as fases do request quando
+      SERVER_TIMING_ENABLED está ativo ou quando um Super Admin envia
+      o header X-Server-Timing.
+    
+    Deve ser o middleware mais externo de instrumentação.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.expose_header = settings.DEBUG or settings.SQL_QUERY_COUNT_HEADER
+        self.budget = settings.SQL_QUERY_BUDGET
+        self.server_timing = settings.SERVER_TIMING_ENABLED
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        stats.server_timing_requested = any(
+            name == b"x-server-timing" for name, _ in scope["headers"]
+        )
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if self.expose_header:
+                    headers.append("X-DB-Query-Count", str(stats.db_statements))
+                if self.server_timing or (stats.server_timing_requested and stats.is_admin):
+                    headers.append(
+                        "Server-Timing", stats.server_timing(time.perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_stats.reset(token)
+            if self.budget > 0 and stats.db_statements > self.budget:
+                self._warn_budget_exceeded(scope, stats)
+
+    def _warn_budget_exceeded(self, scope: Scope, stats: RequestStats) -> None:
+        repeated = stats.repeated_statements()[:3]
+        logger.warning(
+            "SQL query budget exceeded: %s %s executed %d statements (budget %d). "
+            "Repeated: %s",
+            scope["method"],
+            route_label(scope),
+            stats.db_statements,
+            self.budget,
+            "; ".join(f"{count}x {fingerprint}" for fingerprint, count in repeated) or "none",
+        )
+
+
+class MetricsMiddleware:
+    """
+    Registra latência por rota, requests em andamento, contagem por status e
+    statements/tempo de banco por request (lidos do RequestStats do request).
+    
+    O label de rota usa o template da rota (nunca a URL bruta), para manter a
+    cardinalidade das métricas limitada.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        status_code = 500
+        stats = current_request_stats.get() or RequestStats()
+        http_requests_in_progress.inc(method=method)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = route_label(scope)
+            http_requests_in_progress.dec(method=method)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            http_request_db_statements.observe(stats.db_statements, route=route)
+            http_request_db_seconds.observe(stats.db_seconds, route=route)
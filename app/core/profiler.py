@@ -0,0 +1,233 @@
+"""
+Profiler de CPU por request, para uso em produção.
+
+Um request é perfilado quando:
+- envia o header X-Profile com um bearer token de Super Admin (o token é
+  verificado antes de o profiler começar; sem ele o header é ignorado), ou
+- é sorteado por PROFILER_SAMPLE_RATE.
+
+Cada perfil combina:
+- cProfile (determinístico) sobre o handler da rota, executado na thread em
+  que o handler roda;
+- amostragem de stacks (collapsed stacks, formato de flamegraph) da thread do
+  event loop e da thread do handler durante todo o request.
+
+Só um request é perfilado por vez em cada worker; os perfis ficam em memória
+(últimos PROFILER_MAX_STORED) e são consultados pelas rotas /admin/profiles.
+"""
+import cProfile
+import io
+import itertools
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.instrumentation import current_request_stats, route_label
+from app.core.security import decode_access_token
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_ROOT_DIR):
+        filename = os.path.relpath(filename, _ROOT_DIR)
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+class StackSampler(threading.Thread):
+    """Amostra periodicamente as stacks de um conjunto de threads"""
+
+    def __init__(self, thread_ids: Set[int], interval: float):
+        super().__init__(name="request-profiler-sampler", daemon=True)
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfile:
+    """Perfil de CPU de um único request"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.duration: Optional[float] = None
+        self.cprofile = cProfile.Profile()
+        self.thread_ids: Set[int] = {threading.get_ident()}
+        self.sampler = StackSampler(self.thread_ids, settings.PROFILER_INTERVAL_MS / 1000)
+        self._start = time.perf_counter()
+
+    def start(self) -> None:
+        self.sampler.start()
+
+    def stop(self) -> None:
+        self.sampler.stop()
+        self.duration = time.perf_counter() - self._start
+
+    def profile_handler_thread(self) -> None:
+        """Inclui a thread atual (onde o handler roda) na amostragem"""
+        self.thread_ids.add(threading.get_ident())
+
+    def collapsed_stacks(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.sampler.samples.items())
+
+    def pstats_text(self, sort: str = "cumulative", limit: int = 50) -> str:
+        output = io.StringIO()
+        try:
+            stats = pstats.Stats(self.cprofile, stream=output)
+        except TypeError:
+            # Nenhuma função registrada (ex.: request que não chegou ao handler)
+            return ""
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def pstats_dump(self) -> bytes:
+        """Estatísticas no formato de `pstats.Stats.dump_stats` (snakeviz, pstats)"""
+        self.cprofile.create_stats()
+        return marshal.dumps(self.cprofile.stats)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "samples": sum(self.sampler.samples.values()),
+        }
+
+
+class ProfileStore:
+    """Guarda os últimos perfis capturados neste worker"""
+
+    def __init__(self, max_items: int):
+        self._items: Deque[RequestProfile] = deque(maxlen=max_items)
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._items.append(profile)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._items))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            for profile in self._items:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore(settings.PROFILER_MAX_STORED)
+
+# Apenas um request perfilado por vez por worker (limita o overhead)
+_active_profile = threading.Lock()
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token.strip()
+    return None
+
+
+def is_super_admin_token(token: Optional[str]) -> bool:
+    """Token válido de um Super Admin ativo (mesmas regras de get_current_user)"""
+    payload = decode_access_token(token) if token else None
+    username = payload.get("sub") if payload else None
+    if not username:
+        return False
+
+    from app.db.session import SessionLocal
+    from app.services.authz_service import is_super_admin
+    from app.services.user_service import get_user_by_email_or_username
+
+    db = SessionLocal()
+    try:
+        user = get_user_by_email_or_username(db, username, with_role=True)
+        return (
+            user is not None
+            and user.is_active
+            and user.can_access_system
+            and is_super_admin(user)
+        )
+    finally:
+        db.close()
+
+
+class ProfilerMiddleware:
+    """Perfila requests sob demanda (header X-Profile) ou por amostragem"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = any(name == b"x-profile" for name, _ in scope["headers"])
+        if requested:
+            # Só Super Admin pode pedir perfil: clientes anônimos não ocupam o profiler
+            requested = await run_in_threadpool(is_super_admin_token, _bearer_token(scope))
+        sampled = not requested and self.sample_rate > 0 and random.random() < self.sample_rate
+        stats = current_request_stats.get()
+        if not (requested or sampled) or stats is None or not _active_profile.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], "header" if requested else "sampled")
+        stats.profile = profile
+        profile.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.stop()
+            stats.profile = None
+            _active_profile.release()
+            profile.route = route_label(scope)
+            profile_store.add(profile)
@@ -1,5 +1,8 @@
-from typing import Optional, List, TypeVar, Generic
+import time
+from typing import Any, Optional, List, Type, TypeVar, Generic
 from fastapi import status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
 
 from app.schemas.response import (
     BaseResponse,
@@ -11,6 +14,7 @@ from app.schemas.response import (
     MetaPagination
 )
 from app.core.pagination import get_pagination_meta
+from app.core.instrumentation import current_request_stats
 
 T = TypeVar('T')
 
@@ -115,3 +119,29 @@ def delete_response(
     )
 
 
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse que registra o tempo de encoding como fase "encode" do Server-Timing"""
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.add_phase("encode", time.perf_counter() - start)
+        return body
+
+
+def schema_response(envelope: BaseResponse, item_schema: Type[BaseModel]) -> Response:
+    """
+    Serializa um envelope de get/list com outro schema de item (sparse fieldsets,
+    includes). A resposta é devolvida pronta porque o response_model da rota
+    validaria com o schema completo; o JSON é gerado direto pelo pydantic.
+    """
+    envelope_schema = ListResponse[item_schema] if isinstance(envelope, ListResponse) else GetResponse[item_schema]
+    validated = envelope_schema.model_validate(envelope.model_dump(), from_attributes=True)
+    start = time.perf_counter()
+    body = validated.model_dump_json()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.add_phase("encode", time.perf_counter() - start)
+    return Response(content=body, media_type="application/json", status_code=envelope.status)
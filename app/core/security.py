@@ -1,9 +1,11 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 
 from app.core.config import settings
+from app.core.instrumentation import record_bcrypt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,7 +19,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         if isinstance(hashed_password, str):
             hashed_password = hashed_password.encode('utf-8')
         
-        return bcrypt.checkpw(plain_password, hashed_password)
+        start = time.perf_counter()
+        try:
+            return bcrypt.checkpw(plain_password, hashed_password)
+        finally:
+            record_bcrypt("verify", time.perf_counter() - start)
     except Exception:
         return False
 
@@ -37,8 +43,10 @@ def get_password_hash(password: str) -> str:
         password_bytes = password_bytes[:72]
     
     # Gerar salt e hash
+    start = time.perf_counter()
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
+    record_bcrypt("hash", time.perf_counter() - start)
     
     # Retornar como string
     return hashed.decode('utf-8')
@@ -0,0 +1,167 @@
+"""
+Captura amostrada de tráfego real para replay (benchmarks/replay.py).
+
+Uma fração dos requests (TRAFFIC_CAPTURE_SAMPLE_RATE) é gravada, uma linha
+JSON por request, em um arquivo append-only: rota, path, query string, corpo
+(JSON ou formulário), usuário autenticado (subject do JWT), status e duração.
+Senhas, tokens e demais segredos são mascarados antes da gravação; o header
+Authorization nunca é gravado, apenas o subject do token.
+
+A escrita passa por um QueueHandler: o request só enfileira a linha e o
+arquivo é escrito em uma thread de background.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.instrumentation import route_label
+from app.core.security import decode_access_token
+
+logger = logging.getLogger("app.traffic_capture")
+
+SCRUBBED = "***"
+_SECRET_KEY = re.compile(r"pass(word)?|secret|token|authorization|api[_-]?key|credential", re.IGNORECASE)
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_traffic_capture(path: str) -> None:
+    """Configura o arquivo de captura com um handler não bloqueante"""
+    global _listener
+    if _listener is not None:
+        return
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, file_handler)
+    _listener.start()
+    atexit.register(shutdown_traffic_capture)
+
+
+def shutdown_traffic_capture() -> None:
+    """Esvazia a fila e fecha o arquivo de captura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def scrub(value: Any) -> Any:
+    """Mascara recursivamente os valores de chaves sensíveis"""
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if _SECRET_KEY.search(str(key)) else scrub(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+def scrub_pairs(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    return [(key, SCRUBBED if _SECRET_KEY.search(key) else value) for key, value in pairs]
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _subject(scope: Scope) -> Optional[str]:
+    authorization = _header(scope, b"authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    payload = decode_access_token(authorization[7:])
+    return payload.get("sub") if payload else None
+
+
+def _body_fields(content_type: Optional[str], body: bytes) -> dict:
+    if not body:
+        return {}
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    try:
+        if content_type == "application/json":
+            return {"json": scrub(json.loads(body))}
+        if content_type == "application/x-www-form-urlencoded":
+            return {"form": scrub_pairs(parse_qsl(body.decode(), keep_blank_values=True))}
+    except (ValueError, UnicodeDecodeError):
+        pass
+    # Outros formatos (multipart, binário) não são gravados
+    return {"body_omitted": content_type or "unknown"}
+
+
+class TrafficCaptureMiddleware:
+    """Grava uma amostra dos requests para replay"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.sample_rate = settings.TRAFFIC_CAPTURE_SAMPLE_RATE
+        self.max_body = settings.TRAFFIC_CAPTURE_MAX_BODY_BYTES
+        setup_traffic_capture(settings.TRAFFIC_CAPTURE_PATH)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        chunks: List[bytes] = []
+        received = 0
+        status_code = 500
+
+        async def capture_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                received += len(body)
+                if received <= self.max_body:
+                    chunks.append(body)
+            return message
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            duration = time.perf_counter() - start
+            record = {
+                "ts": round(started_at, 3),
+                "method": scope["method"],
+                "route": route_label(scope),
+                "path": scope["path"],
+                "query": scrub_pairs(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)),
+                "subject": _subject(scope),
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 3),
+            }
+            if received > self.max_body:
+                record["body_truncated"] = received
+            else:
+                record.update(_body_fields(_header(scope, b"content-type"), b"".join(chunks)))
+            logger.info(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
@@ -0,0 +1,122 @@
+"""
+Loaders por request (estilo DataLoader) para users, roles e módulos.
+
+Um mesmo request costuma buscar a mesma entidade várias vezes (a rota busca o
+role e o service de update busca de novo; get_current_user já carregou o
+usuário que a rota volta a buscar). Os loaders ficam em `db.info` da sessão
+do request, então todo service que recebe `db` compartilha o mesmo cache:
+
+- load(key): devolve do cache ou busca (uma query);
+- load_many(keys): busca todas as chaves ainda não carregadas em uma única
+  query IN e devolve um dict chave -> objeto (chaves inexistentes ficam de fora);
+- prime(obj): registra um objeto já carregado por outra query.
+
+Os handlers são síncronos e a sessão não é compartilhada entre threads: não
+há buscas concorrentes dentro de um request para agrupar sozinhas. Quem
+conhece várias chaves de antemão usa load_many (um IN em vez de N queries).
+
+Só objetos persistentes da sessão são reaproveitados: objetos removidos,
+desfeitos por rollback ou desanexados são buscados novamente, assim como
+objetos cuja chave natural (key) mudou. Buscas sem resultado não são
+guardadas (o registro pode ser criado no mesmo request).
+"""
+from typing import Dict, Generic, Iterable, Optional, Type, TypeVar
+
+from fastapi import Depends
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import ObjectDeletedError
+
+from app.db.session import get_db
+from app.models.module import Module
+from app.models.role import Role
+from app.models.user import User
+
+M = TypeVar("M")
+K = TypeVar("K")
+
+
+class Loader(Generic[K, M]):
+    """Cache por chave de um model, com busca em lote"""
+
+    def __init__(self, db: Session, model: Type[M], attribute: str):
+        self.db = db
+        self.model = model
+        self.attribute = attribute
+        self.column = getattr(model, attribute)
+        self._cache: Dict[K, M] = {}
+
+    def _cached(self, key: K) -> Optional[M]:
+        obj = self._cache.get(key)
+        if obj is None:
+            return None
+        try:
+            valid = inspect(obj).persistent and getattr(obj, self.attribute) == key
+        except ObjectDeletedError:
+            valid = False
+        if not valid:
+            del self._cache[key]
+            return None
+        return obj
+
+    def load(self, key: K) -> Optional[M]:
+        """Busca um objeto pela chave (do cache, se já carregado no request)"""
+        obj = self._cached(key)
+        if obj is None:
+            obj = self.db.query(self.model).filter(self.column == key).first()
+            if obj is not None:
+                self._cache[key] = obj
+        return obj
+
+    def load_many(self, keys: Iterable[K]) -> Dict[K, M]:
+        """Busca várias chaves; as que faltam no cache vêm em uma única query"""
+        found: Dict[K, M] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            obj = self._cached(key)
+            if obj is None:
+                missing.append(key)
+            else:
+                found[key] = obj
+        if missing:
+            for obj in self.db.query(self.model).filter(self.column.in_(missing)).all():
+                key = getattr(obj, self.attribute)
+                self._cache[key] = found[key] = obj
+        return found
+
+    def prime(self, obj: M) -> None:
+        """Registra um objeto já carregado"""
+        self._cache[getattr(obj, self.attribute)] = obj
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class Loaders:
+    """Loaders de um request (uma instância por sessão)"""
+
+    def __init__(self, db: Session):
+        self.users: Loader[int, User] = Loader(db, User, "id")
+        self.roles: Loader[int, Role] = Loader(db, Role, "id")
+        self.roles_by_key: Loader[str, Role] = Loader(db, Role, "key")
+        self.modules: Loader[int, Module] = Loader(db, Module, "id")
+        self.modules_by_key: Loader[str, Module] = Loader(db, Module, "key")
+
+    def prime_user(self, user: User) -> None:
+        """Registra um usuário (e o role, se já carregado) nos loaders"""
+        self.users.prime(user)
+        role = user.__dict__.get("role")
+        if role is not None:
+            self.roles.prime(role)
+            self.roles_by_key.prime(role)
+
+
+def get_loaders(db: Session = Depends(get_db)) -> Loaders:
+    """
+    Loaders do request, criados na primeira chamada e guardados na sessão.
+    Usar com Depends(get_loaders) nas rotas ou get_loaders(db) nos services.
+    """
+    loaders = db.info.get("loaders")
+    if loaders is None:
+        loaders = db.info["loaders"] = Loaders(db)
+    return loaders
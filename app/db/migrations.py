@@ -0,0 +1,33 @@
+"""
+Execução das migrations do Alembic a partir do código (scripts, benchmarks, testes).
+
+As migrations rodam na conexão da engine informada, o que também funciona
+com SQLite em memória (o banco só existe na conexão da aplicação).
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def alembic_config() -> Config:
+    config = Config(str(ROOT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    return config
+
+
+def head_revision() -> str:
+    """Revisão head do Alembic (identifica a versão do schema)"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def upgrade_to_head(engine: Engine) -> None:
+    """Aplica as migrations pendentes no banco da engine"""
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
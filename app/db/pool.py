@@ -0,0 +1,188 @@
+"""
+Instrumentação do pool de conexões do SQLAlchemy.
+
+Registra checkouts, tempo de espera por conexão e timeouts do pool,
+para dimensionar pool_size/max_overflow frente ao max_connections do Postgres.
+
+Também implementa a verificação de liveness sensível a ociosidade, que
+substitui o pool_pre_ping (um SELECT 1 a cada checkout).
+"""
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import REGISTRY
+
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+pool_checkouts = REGISTRY.counter(
+    "db_pool_checkouts_total", "Conexões retiradas do pool", ["pool"]
+)
+pool_checked_out = REGISTRY.gauge(
+    "db_pool_checked_out", "Conexões atualmente em uso", ["pool"]
+)
+pool_connects = REGISTRY.counter(
+    "db_pool_connects_total", "Novas conexões DBAPI abertas", ["pool"]
+)
+pool_invalidations = REGISTRY.counter(
+    "db_pool_invalidations_total", "Conexões invalidadas", ["pool"]
+)
+pool_timeouts = REGISTRY.counter(
+    "db_pool_timeouts_total", "Esperas por conexão que estouraram pool_timeout", ["pool"]
+)
+pool_wait_seconds = REGISTRY.histogram(
+    "db_pool_wait_seconds", "Tempo esperando por uma conexão do pool", ["pool"],
+    buckets=POOL_WAIT_BUCKETS
+)
+pool_hold_seconds = REGISTRY.histogram(
+    "db_pool_connection_hold_seconds", "Tempo entre checkout e checkin de uma conexão", ["pool"],
+    buckets=POOL_WAIT_BUCKETS
+)
+
+pool_pings = REGISTRY.counter(
+    "db_pool_pings_total", "Pings de liveness executados no checkout", ["pool"]
+)
+pool_pings_avoided = REGISTRY.counter(
+    "db_pool_pings_avoided_total", "Checkouts que dispensaram o ping (conexão recente)", ["pool"]
+)
+pool_ping_failures = REGISTRY.counter(
+    "db_pool_ping_failures_total", "Pings que detectaram conexão morta", ["pool"]
+)
+pool_disconnects = REGISTRY.counter(
+    "db_pool_disconnects_total", "Erros de desconexão detectados durante statements", ["pool"]
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de espera por conexão e os timeouts"""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(pool=self.metrics_name)
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start, pool=self.metrics_name)
+
+
+def instrument_pool(engine: Engine, name: str = "primary") -> None:
+    """Registra os listeners de eventos do pool da engine"""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.metrics_name = name
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_connects.inc(pool=name)
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        # Um checkout refeito no mesmo registro (ex.: após um ping com falha)
+        # não conta de novo
+        if "checkout_time" in connection_record.info:
+            return
+        pool_checkouts.inc(pool=name)
+        pool_checked_out.inc(pool=name)
+        connection_record.info["checkout_time"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_checked_out.dec(pool=name)
+        if connection_record is not None:
+            checkout_time = connection_record.info.pop("checkout_time", None)
+            if checkout_time is not None:
+                pool_hold_seconds.observe(time.perf_counter() - checkout_time, pool=name)
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_invalidations.inc(pool=name)
+
+
+def install_idle_liveness_check(
+    engine: Engine,
+    idle_seconds: float,
+    name: str = "primary"
+) -> None:
+    """
+    Verificação de liveness que só pinga conexões ociosas há mais de `idle_seconds`.
+    
+    Conexões usadas recentemente são entregues sem round-trip extra. Se o ping
+    (o do próprio dialeto, como no pool_pre_ping) falhar, DisconnectionError
+    faz o pool descartar a conexão e tentar outra. O listener roda antes dos
+    de métricas (insert=True), então a tentativa descartada não é contada
+    como checkout.
+    Desconexões que ocorrerem durante um statement são tratadas pelo próprio
+    SQLAlchemy, que invalida o pool inteiro de uma vez; aqui apenas são contadas.
+    """
+    pool = engine.pool
+
+    @event.listens_for(pool, "connect")
+    def mark_connected(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(pool, "checkin")
+    def mark_checkin(dbapi_connection, connection_record):
+        if connection_record is not None:
+            connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout", insert=True)
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        now = time.monotonic()
+        last_used = connection_record.info.get("last_used", now)
+        if now - last_used < idle_seconds:
+            pool_pings_avoided.inc(pool=name)
+            return
+
+        pool_pings.inc(pool=name)
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception as exc:
+            pool_ping_failures.inc(pool=name)
+            raise DisconnectionError("Idle connection failed liveness ping") from exc
+        if not alive:
+            pool_ping_failures.inc(pool=name)
+            raise DisconnectionError("Idle connection failed liveness ping")
+
+    @event.listens_for(engine, "handle_error")
+    def count_disconnects(context):
+        if context.is_disconnect:
+            pool_disconnects.inc(pool=name)
+
+
+def pool_stats(engine: Engine, name: str = "primary") -> dict:
+    """Retorna o estado atual do pool e as métricas acumuladas"""
+    pool = engine.pool
+    stats = {
+        "pool": name,
+        "class": type(pool).__name__,
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    stats.update({
+        "checkouts_total": pool_checkouts.get(pool=name),
+        "connects_total": pool_connects.get(pool=name),
+        "invalidations_total": pool_invalidations.get(pool=name),
+        "timeouts_total": pool_timeouts.get(pool=name),
+        "pings_total": pool_pings.get(pool=name),
+        "pings_avoided_total": pool_pings_avoided.get(pool=name),
+        "ping_failures_total": pool_ping_failures.get(pool=name),
+        "disconnects_total": pool_disconnects.get(pool=name),
+        "wait_seconds": pool_wait_seconds.snapshot().get(name),
+        "hold_seconds": pool_hold_seconds.snapshot().get(name),
+    })
+    return stats
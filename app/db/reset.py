@@ -0,0 +1,178 @@
+"""
+Reset rápido do banco de desenvolvimento/testes.
+
+Em vez de dropar tudo, rodar todas as migrations e os seeds a cada reset:
+
+- template: mantém um banco já migrado e populado pelos seeds, identificado
+  pela revisão head do Alembic + fingerprint dos seeds. O reset recria o banco
+  a partir dele (CREATE DATABASE ... TEMPLATE no PostgreSQL, cópia do arquivo
+  no SQLite). O template é reconstruído quando migrations ou seeds mudam.
+  Templates de outras versões não são apagados automaticamente: o servidor
+  pode ser compartilhado por outros checkouts/branches que ainda os usam.
+  Com prune=True (--prune no script) são removidos.
+- truncate: com o banco já na revisão head, esvazia todas as tabelas
+  (reiniciando as sequences) e roda os seeds novamente. É o modo mais rápido
+  para isolamento entre testes.
+
+Conexões abertas para o banco resetado ficam inválidas no modo template:
+chame engine.dispose() na engine da aplicação depois do reset.
+"""
+import hashlib
+import inspect
+import json
+import shutil
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.modules_registry import MODULES_REGISTRY
+from app.db import seeds
+from app.db.base import Base
+from app.db.migrations import head_revision, upgrade_to_head
+from app.db.sqlite import is_memory
+
+
+def seed_fingerprint() -> str:
+    """Muda sempre que o código dos seeds ou o registry de módulos mudar"""
+    content = inspect.getsource(seeds) + json.dumps(MODULES_REGISTRY, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def template_key() -> str:
+    """Identificador do template: revisão head do Alembic + fingerprint dos seeds"""
+    content = f"{head_revision()}:{seed_fingerprint()}"
+    return hashlib.sha256(content.encode()).hexdigest()[:12]
+
+
+def migrate_and_seed(engine: Engine) -> None:
+    upgrade_to_head(engine)
+    with Session(bind=engine) as db:
+        seeds.run_seeds(db)
+
+
+def _current_revision(engine: Engine) -> str | None:
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except Exception:
+            return None
+
+
+def reset_by_truncate(url: str) -> None:
+    """Esvazia todas as tabelas (menos alembic_version) e roda os seeds"""
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        if _current_revision(engine) != head_revision():
+            raise ValueError("Database is not at the Alembic head revision; use the template strategy")
+
+        tables = [table.name for table in reversed(Base.metadata.sorted_tables)]
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                names = ", ".join(f'"{name}"' for name in tables)
+                conn.execute(text(f"TRUNCATE TABLE {names} RESTART IDENTITY CASCADE"))
+            else:
+                for name in tables:
+                    conn.execute(text(f'DELETE FROM "{name}"'))
+                if engine.dialect.name == "sqlite":
+                    has_sequences = conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'")
+                    ).scalar()
+                    if has_sequences:
+                        conn.execute(text("DELETE FROM sqlite_sequence"))
+
+        with Session(bind=engine) as db:
+            seeds.run_seeds(db)
+    finally:
+        engine.dispose()
+
+
+def _reset_postgres_from_template(url: str, prune: bool = False) -> None:
+    target = make_url(url)
+    database = target.database
+    template = f"{database}_tpl_{template_key()}"
+    admin = create_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    try:
+        with admin.connect() as conn:
+            existing = set(conn.execute(
+                text("SELECT datname FROM pg_database WHERE datname LIKE :pattern"),
+                {"pattern": f"{database}\\_tpl\\_%"}
+            ).scalars())
+            # Templates de outras versões de migrations/seeds (só com prune)
+            if prune:
+                for stale in existing - {template}:
+                    conn.execute(text(f'DROP DATABASE "{stale}"'))
+
+            if template not in existing:
+                conn.execute(text(f'CREATE DATABASE "{template}"'))
+                template_engine = create_engine(target.set(database=template), poolclass=NullPool)
+                try:
+                    migrate_and_seed(template_engine)
+                except Exception:
+                    template_engine.dispose()
+                    conn.execute(text(f'DROP DATABASE "{template}"'))
+                    raise
+                template_engine.dispose()
+
+            conn.execute(
+                text("SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                     "WHERE datname = :database AND pid <> pg_backend_pid()"),
+                {"database": database}
+            )
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{database}"'))
+            conn.execute(text(f'CREATE DATABASE "{database}" TEMPLATE "{template}"'))
+    finally:
+        admin.dispose()
+
+
+def _reset_sqlite_from_template(url: str, prune: bool = False) -> None:
+    path = Path(make_url(url).database)
+    template = path.with_name(f"{path.name}.tpl-{template_key()}")
+    # Templates de outras versões de migrations/seeds (só com prune)
+    if prune:
+        for stale in path.parent.glob(f"{path.name}.tpl-*"):
+            if stale != template:
+                stale.unlink()
+
+    if not template.exists():
+        building = template.with_name(template.name + ".building")
+        building.unlink(missing_ok=True)
+        template_engine = create_engine(f"sqlite:///{building}", poolclass=NullPool)
+        try:
+            migrate_and_seed(template_engine)
+        finally:
+            template_engine.dispose()
+        building.rename(template)
+
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    shutil.copyfile(template, path)
+
+
+def reset_from_template(url: str, prune: bool = False) -> None:
+    """
+    Recria o banco a partir do template (criado/atualizado se necessário).
+    prune=True apaga os templates de outras versões de migrations/seeds.
+    """
+    backend = make_url(url).get_backend_name()
+    if backend == "postgresql":
+        _reset_postgres_from_template(url, prune)
+    elif backend == "sqlite" and not is_memory(url):
+        _reset_sqlite_from_template(url, prune)
+    else:
+        raise ValueError(f"Template reset is not supported for {url.split(':', 1)[0]} databases")
+
+
+def reset_database(url: str, strategy: str = "template", prune: bool = False) -> float:
+    """Reseta o banco com a estratégia informada e retorna a duração em segundos"""
+    start = time.perf_counter()
+    if strategy == "template":
+        reset_from_template(url, prune)
+    elif strategy == "truncate":
+        reset_by_truncate(url)
+    else:
+        raise ValueError(f"Unknown reset strategy: {strategy}")
+    return time.perf_counter() - start
@@ -1,17 +1,141 @@
-from sqlalchemy import create_engine
+from itertools import count
+from threading import Lock
+from typing import List
+
+from sqlalchemy import create_engine, Delete, Insert, Update
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
+from fastapi import Depends
 
 from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.core.instrumentation import instrument_engine
+from app.db.pool import InstrumentedQueuePool, install_idle_liveness_check, instrument_pool
+from app.db.slow_query import install_slow_query_log
+from app.db.sqlite import install_sqlite_pragmas, is_memory, is_sqlite, sqlite_engine_options
 
-# Cria a engine do banco de dados
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG,  # Log SQL queries em modo debug
+early_releases = REGISTRY.counter(
+    "db_session_early_releases_total",
+    "Sessões que devolveram a conexão antes da serialização da resposta"
 )
 
+
+def _create_engine(url: str, name: str) -> Engine:
+    """Cria uma engine com o pool configurado e instrumentado"""
+    sqlite = is_sqlite(url)
+    if sqlite:
+        pool_options = sqlite_engine_options(url)
+    else:
+        pool_options = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    pool_options.setdefault("poolclass", InstrumentedQueuePool)
+    
+    db_engine = create_engine(
+        url,
+        echo=settings.DB_ECHO,  # Log de todas as queries (use o slow query log no dia a dia)
+        **pool_options,
+    )
+    if sqlite:
+        install_sqlite_pragmas(db_engine, memory=is_memory(url))
+    instrument_pool(db_engine, name)
+    instrument_engine(db_engine)
+    if settings.SLOW_QUERY_THRESHOLD_MS >= 0:
+        install_slow_query_log(
+            db_engine,
+            settings.SLOW_QUERY_THRESHOLD_MS,
+            settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        )
+    # Conexões SQLite são locais: não há conexão "morta" para detectar
+    if not sqlite and not settings.DB_POOL_PRE_PING and settings.DB_POOL_PING_IDLE_SECONDS >= 0:
+        install_idle_liveness_check(db_engine, settings.DB_POOL_PING_IDLE_SECONDS, name)
+    return db_engine
+
+
+# Cria a engine do banco de dados (primário)
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+# Engines das réplicas de leitura (opcionais)
+replica_engines: List[Engine] = [
+    _create_engine(url, f"replica-{index}")
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+
+
+class ReplicaSelector:
+    """Escolhe a réplica de leitura: round-robin ou menor número de conexões em uso"""
+
+    def __init__(self, engines: List[Engine], strategy: str = "round_robin"):
+        self.engines = engines
+        self.strategy = strategy
+        self._counter = count()
+        self._lock = Lock()
+
+    def choose(self) -> Engine:
+        if self.strategy == "least_connections":
+            return min(self.engines, key=lambda e: e.pool.checkedout())
+        with self._lock:
+            index = next(self._counter)
+        return self.engines[index % len(self.engines)]
+
+
+replica_selector = ReplicaSelector(replica_engines, settings.DB_REPLICA_STRATEGY)
+
+
+class RoutingSession(Session):
+    """
+    Sessão que direciona leituras para réplicas e escritas para o primário.
+    
+    Leituras vão para uma réplica quando a sessão foi marcada como somente
+    leitura (`use_read_replica`) ou quando o statement pede explicitamente
+    (`execution_options(use_replica=True)`). Após a primeira escrita a sessão
+    fica fixada no primário até o fim do request (read-your-writes).
+    
+    A réplica é escolhida uma vez por sessão: todas as leituras do request
+    (listagem e contagem, pai e lazy load do filho) vêm do mesmo servidor,
+    com o mesmo atraso de replicação, e o request segura uma conexão só.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["pinned_primary"] = True
+            return engine
+        
+        if not replica_engines or self.info.get("pinned_primary"):
+            return engine
+        
+        use_replica = self.info.get("read_only", False)
+        if clause is not None and hasattr(clause, "get_execution_options"):
+            use_replica = clause.get_execution_options().get("use_replica", use_replica)
+        
+        return self._replica() if use_replica else engine
+    
+    def _replica(self) -> Engine:
+        replica = self.info.get("replica_engine")
+        if replica is None:
+            replica = self.info["replica_engine"] = replica_selector.choose()
+        return replica
+    
+    def close(self) -> None:
+        super().close()
+        self.info.pop("replica_engine", None)
+
+
 # SessionLocal é uma factory para criar sessões
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# No modo de liberação antecipada os objetos não expiram no commit, para
+# continuarem legíveis depois de desanexados da sessão
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    expire_on_commit=not settings.DB_SESSION_EARLY_RELEASE,
+)
 
 
 def get_db() -> Session:
@@ -25,3 +149,26 @@ def get_db() -> Session:
     finally:
         db.close()
 
+
+def use_read_replica(db: Session = Depends(get_db)) -> None:
+    """
+    Marca a sessão do request como somente leitura (leituras vão para réplicas).
+    
+    Usar em rotas GET via dependencies=[Depends(use_read_replica)]: dependências
+    da rota são resolvidas antes das demais, então autenticação e verificação
+    de permissões também leem das réplicas.
+    """
+    db.info["read_only"] = True
+
+
+def release_connection(db: Session) -> None:
+    """
+    Encerra a transação e devolve a(s) conexão(ões) ao pool, mantendo os objetos
+    já carregados legíveis (desanexados) para a serialização da resposta.
+    
+    Alterações não commitadas são descartadas, como já acontecia no close()
+    do get_db.
+    """
+    if db.in_transaction():
+        early_releases.inc()
+    db.close()
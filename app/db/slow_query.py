@@ -0,0 +1,176 @@
+"""
+Log de queries lentas.
+
+Substitui o echo=DEBUG (que loga todo statement de forma síncrona): apenas
+statements acima do limite são registrados, com o formato dos parâmetros
+(tipos, nunca valores) e a rota que os executou. Uma fração amostrada dos
+SELECTs lentos tem o plano capturado com EXPLAIN (ANALYZE, BUFFERS).
+
+A saída passa por um QueueHandler: o request só enfileira o registro, e a
+escrita (e o EXPLAIN) acontecem em threads de background.
+"""
+import atexit
+import logging
+import queue
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.pool import NullPool
+
+from app.core.instrumentation import current_request_stats
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger("app.slow_query")
+
+slow_queries_total = REGISTRY.counter(
+    "db_slow_queries_total", "Statements acima do limite de query lenta"
+)
+
+_listener: Optional[QueueListener] = None
+_explain_executor: Optional[ThreadPoolExecutor] = None
+# URL da engine monitorada -> engine dedicada ao EXPLAIN no mesmo servidor
+_explain_engines: Dict[URL, Engine] = {}
+_explain_pending = 0
+_explain_lock = Lock()
+# Máximo de EXPLAINs aguardando execução; excedentes são descartados
+MAX_PENDING_EXPLAINS = 4
+
+
+def setup_slow_query_logging() -> None:
+    """Configura o logger de queries lentas com um handler não bloqueante"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_slow_query_logging)
+
+
+def shutdown_slow_query_logging() -> None:
+    """Esvazia a fila de logs e encerra as threads de background"""
+    global _listener, _explain_executor
+    if _explain_executor is not None:
+        _explain_executor.shutdown(wait=False)
+        _explain_executor = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Descreve os parâmetros pelos tipos, sem expor valores"""
+    if executemany:
+        return f"executemany[{len(parameters)}]"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain_engine_for(engine: Engine) -> Engine:
+    """
+    Engine dedicada, sem pool, para EXPLAIN no mesmo servidor da engine
+    (primário e cada réplica têm a sua), sem competir com as conexões dos requests.
+    """
+    explain_engine = _explain_engines.get(engine.url)
+    if explain_engine is None:
+        explain_engine = _explain_engines[engine.url] = create_engine(engine.url, poolclass=NullPool)
+    return explain_engine
+
+
+def _run_explain(explain_engine: Engine, statement: str, parameters: Any, route: Optional[str]) -> None:
+    global _explain_pending
+    try:
+        with explain_engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            ).fetchall()
+            # EXPLAIN ANALYZE executa a query; nunca manter efeitos
+            connection.rollback()
+        plan = "\n".join(row[0] for row in rows)
+        logger.info("EXPLAIN route=%s\n%s\n%s", route, statement, plan)
+    except Exception as exc:
+        logger.info("EXPLAIN failed route=%s: %s", route, exc)
+    finally:
+        with _explain_lock:
+            _explain_pending -= 1
+
+
+def _schedule_explain(explain_engine: Engine, statement: str, parameters: Any, route: Optional[str]) -> None:
+    global _explain_pending
+    with _explain_lock:
+        if _explain_pending >= MAX_PENDING_EXPLAINS:
+            return
+        _explain_pending += 1
+    _explain_executor.submit(_run_explain, explain_engine, statement, parameters, route)
+
+
+def install_slow_query_log(
+    engine: Engine,
+    threshold_ms: float,
+    explain_sample_rate: float = 0.0
+) -> None:
+    """Registra os listeners que detectam e logam queries lentas na engine"""
+    global _explain_executor
+    setup_slow_query_logging()
+
+    threshold = threshold_ms / 1000
+    # EXPLAIN (ANALYZE, BUFFERS) só existe no Postgres
+    explain_enabled = explain_sample_rate > 0 and engine.dialect.name == "postgresql"
+    explain_engine = None
+    if explain_enabled:
+        if _explain_executor is None:
+            _explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        explain_engine = _explain_engine_for(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed < threshold:
+            return
+
+        slow_queries_total.inc()
+        stats = current_request_stats.get()
+        route = stats.route if stats is not None else None
+        logger.warning(
+            "slow query %.1fms route=%s params=%s\n%s",
+            elapsed * 1000,
+            route,
+            parameter_shape(parameters, executemany),
+            statement,
+        )
+
+        if (
+            explain_enabled
+            and not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < explain_sample_rate
+        ):
+            _schedule_explain(explain_engine, statement, parameters, route)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        start_times = context.connection.info.get("slow_query_start") if context.connection else None
+        if start_times:
+            start_times.pop()
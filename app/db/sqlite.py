@@ -0,0 +1,74 @@
+"""
+Perfil SQLite (arquivo ou memória) para desenvolvimento local, benchmarks e testes.
+
+- Arquivo (`sqlite:///./data/app.db`): pool de conexões normal, WAL para que
+  leitores não bloqueiem o escritor, synchronous=NORMAL (seguro com WAL) e
+  busy_timeout para esperar locks em vez de falhar com "database is locked".
+- Memória (`sqlite://` ou `sqlite:///:memory:`): cada conexão teria um banco
+  próprio, então uma única conexão é compartilhada entre threads
+  (StaticPool). Adequado para testes; o banco some com o processo.
+
+Em todos os casos foreign_keys=ON é ligado por conexão (o SQLite vem com ele
+desligado), para que ondelete=CASCADE funcione como no Postgres.
+"""
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory(url: str) -> bool:
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return database in ("", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def sqlite_engine_options(url: str) -> Dict[str, Any]:
+    """Opções de create_engine para o perfil SQLite (substituem as do pool)"""
+    if is_memory(url):
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    database = make_url(url).database
+    if database and not database.startswith("file:"):
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+    }
+
+
+def install_sqlite_pragmas(engine: Engine, memory: bool = False) -> None:
+    """Configura cada nova conexão SQLite (WAL, synchronous, cache, foreign keys)"""
+    pragmas = [
+        "PRAGMA foreign_keys=ON",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if not memory:
+        pragmas.insert(0, f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
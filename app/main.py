@@ -1,7 +1,11 @@
-from fastapi import FastAPI, Request
+import secrets
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
 from app.core.exceptions import (
@@ -9,14 +13,36 @@ from app.core.exceptions import (
     validation_exception_handler,
     generic_exception_handler
 )
-from app.api.v1.routes import auth, users, access
+from app.core.metrics import render_prometheus
+from app.core.responses import TimedJSONResponse
+from app.core.middleware import MetricsMiddleware, RequestStatsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.traffic_capture import TrafficCaptureMiddleware
+from app.core.loop_watchdog import loop_watchdog
+from app.api.v1.routes import auth, users, access, admin
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicialização e encerramento da aplicação"""
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    yield
+    if settings.LOOP_WATCHDOG_ENABLED:
+        await loop_watchdog.stop()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    default_response_class=TimedJSONResponse,
+    lifespan=lifespan,
 )
 
+# Middlewares: o último adicionado é o mais externo. Ordem efetiva, de fora
+# para dentro: RequestStats -> TrafficCapture -> Metrics -> Profiler -> CORS.
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +52,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiler sob demanda (header X-Profile de Super Admin ou amostragem)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Métricas (envolve profiler, CORS e a aplicação)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Captura amostrada de tráfego para replay (benchmarks/replay.py)
+if settings.TRAFFIC_CAPTURE_ENABLED:
+    app.add_middleware(TrafficCaptureMiddleware)
+
+# Estatísticas por request (contagem de queries/N+1); o mais externo, porque
+# o de métricas e a captura de tráfego leem o RequestStats
+app.add_middleware(RequestStatsMiddleware)
+
 # Exception handlers para padronizar respostas de erro
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -35,6 +77,7 @@ app.add_exception_handler(Exception, generic_exception_handler)
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(access.router, prefix="/api/v1/access", tags=["access"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -50,3 +93,31 @@ def read_root():
 def health_check():
     return {"status": "ok"}
 
+
+LOCAL_CLIENTS = {"127.0.0.1", "::1"}
+
+
+def require_metrics_access(request: Request) -> None:
+    """
+    /metrics expõe rotas, volumes e latências: não deve ser público.
+    Com METRICS_TOKEN configurado exige "Authorization: Bearer <token>";
+    sem token, só responde a clientes locais (sidecar/scraper no mesmo host).
+    """
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        return
+    if request.client is None or request.client.host not in LOCAL_CLIENTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+    def metrics():
+        """Métricas deste worker no formato do Prometheus"""
+        return PlainTextResponse(
+            render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
@@ -10,7 +10,7 @@ class RoleModulePermission(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     role_id = Column(Integer, ForeignKey("roles.id", ondelete="CASCADE"), nullable=False)
-    module_id = Column(Integer, ForeignKey("modules.id", ondelete="CASCADE"), nullable=False)
+    module_id = Column(Integer, ForeignKey("modules.id", ondelete="CASCADE"), index=True, nullable=False)
     can_read = Column(Boolean, default=False, nullable=False)
     can_create = Column(Boolean, default=False, nullable=False)
     can_update = Column(Boolean, default=False, nullable=False)
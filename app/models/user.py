@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,10 +17,16 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     can_access_system = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False, nullable=False)
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=True)
+    role_id = Column(Integer, ForeignKey("roles.id"), index=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     
     # Relacionamentos
     role = relationship("Role", back_populates="users")
+    
+    # Login e resolução do token buscam email/username sem diferenciar maiúsculas
+    __table_args__ = (
+        Index("ix_users_lower_email", func.lower(email), unique=True),
+        Index("ix_users_lower_username", func.lower(username), unique=True),
+    )
 
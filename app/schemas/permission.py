@@ -1,8 +1,11 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from app.schemas.role import Role
 from app.schemas.module import Module
 
+# Máximo de itens por chamada em POST /access/check
+MAX_PERMISSION_CHECKS = 100
+
 
 class PermissionBase(BaseModel):
     can_read: bool = False
@@ -46,3 +49,15 @@ class UserRoleUpdate(BaseModel):
     """Payload para atualizar role de um usuário"""
     role_id: int
 
+
+
+class PermissionCheckItem(BaseModel):
+    """Item de verificação de permissão (user_id ausente = usuário atual)"""
+    user_id: Optional[int] = None
+    module_key: str
+    action: Literal["read", "create", "update", "delete"]
+
+
+class PermissionCheckRequest(BaseModel):
+    """Payload para verificação de permissões em lote"""
+    checks: List[PermissionCheckItem] = Field(..., max_length=MAX_PERMISSION_CHECKS)
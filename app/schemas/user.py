@@ -1,6 +1,9 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+# Máximo de ids por chamada em POST /users/batch-get
+MAX_BATCH_IDS = 100
 
 
 class UserBase(BaseModel):
@@ -42,3 +45,13 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+
+class UserBatchGetRequest(BaseModel):
+    """Payload para busca de vários usuários por ID"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class UserBatchGetResult(BaseModel):
+    """Usuários encontrados (na ordem dos ids enviados) e ids inexistentes"""
+    users: List[User]
+    missing_ids: List[int]
@@ -1,5 +1,5 @@
-from typing import Literal
-from sqlalchemy.orm import Session
+from typing import Dict, List, Literal, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 
 from app.models.user import User
@@ -44,15 +44,20 @@ def has_permission(
         return False
     
     # Buscar permissão específica
+    # Leitura de permissões pode ser servida por réplica
     permission = db.query(RoleModulePermission).join(Module).filter(
         RoleModulePermission.role_id == user.role_id,
         Module.key == module_key
-    ).first()
+    ).execution_options(use_replica=True).first()
     
     if not permission:
         return False
     
-    # Verificar ação específica
+    return _action_allowed(permission, action)
+
+
+def _action_allowed(permission: RoleModulePermission, action: Action) -> bool:
+    """Verifica se a permissão concede a ação informada"""
     action_map = {
         "read": permission.can_read,
         "create": permission.can_create,
@@ -63,6 +68,66 @@ def has_permission(
     return action_map.get(action, False)
 
 
+def check_permissions(
+    db: Session,
+    current_user: User,
+    checks: List[Tuple[Optional[int], str, Action]]
+) -> List[bool]:
+    """
+    Avalia várias verificações de permissão de uma só vez.
+    
+    Todos os usuários e permissões necessários são carregados em no máximo
+    duas queries, independentemente do número de itens.
+    
+    Args:
+        db: Sessão do banco de dados
+        current_user: Usuário atual (usado quando o item não informa user_id)
+        checks: Lista de tuplas (user_id ou None, module_key, action)
+    
+    Returns:
+        Lista de booleanos na mesma ordem de `checks`
+    """
+    users: Dict[int, User] = {current_user.id: current_user}
+    
+    # Carregar os demais usuários (com role) em uma única query
+    other_ids = {
+        user_id for user_id, _, _ in checks
+        if user_id is not None and user_id not in users
+    }
+    if other_ids:
+        for user in db.query(User).options(joinedload(User.role)).filter(
+            User.id.in_(other_ids)
+        ).execution_options(use_replica=True).all():
+            users[user.id] = user
+    
+    # Carregar as permissões de todos os roles/módulos envolvidos em uma única query
+    role_ids = {
+        user.role_id for user in users.values()
+        if user.role and not is_super_admin(user)
+    }
+    module_keys = {module_key for _, module_key, _ in checks}
+    grants: Dict[Tuple[int, str], RoleModulePermission] = {}
+    if role_ids and module_keys:
+        rows = db.query(RoleModulePermission, Module.key).join(Module).filter(
+            RoleModulePermission.role_id.in_(role_ids),
+            Module.key.in_(module_keys)
+        ).execution_options(use_replica=True).all()
+        grants = {(permission.role_id, key): permission for permission, key in rows}
+    
+    results = []
+    for user_id, module_key, action in checks:
+        user = users.get(current_user.id if user_id is None else user_id)
+        if user is None or not user.role:
+            results.append(False)
+        elif is_super_admin(user):
+            results.append(True)
+        else:
+            permission = grants.get((user.role_id, module_key))
+            results.append(bool(permission) and _action_allowed(permission, action))
+    
+    return results
+
+
 def enforce_permission(
     db: Session,
     user: User,
@@ -2,17 +2,18 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.models.module import Module
+from app.db.loaders import get_loaders
 from app.core.modules_registry import MODULES_REGISTRY
 
 
 def get_module(db: Session, module_id: int) -> Optional[Module]:
-    """Busca um módulo por ID"""
-    return db.query(Module).filter(Module.id == module_id).first()
+    """Busca um módulo por ID (cache do request)"""
+    return get_loaders(db).modules.load(module_id)
 
 
 def get_module_by_key(db: Session, key: str) -> Optional[Module]:
-    """Busca um módulo por key"""
-    return db.query(Module).filter(Module.key == key).first()
+    """Busca um módulo por key (cache do request)"""
+    return get_loaders(db).modules_by_key.load(key)
 
 
 def get_modules(db: Session) -> List[Module]:
@@ -1,9 +1,10 @@
 from typing import List, Dict
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.models.role import Role
 from app.models.module import Module
 from app.models.role_module_permission import RoleModulePermission
+from app.db.loaders import get_loaders
 from app.schemas.permission import PermissionUpdate, ModulePermission
 
 
@@ -24,7 +25,7 @@ def get_role_permission_matrix(db: Session, role_id: int) -> Dict:
             "modules": List[ModulePermission]
         }
     """
-    role = db.query(Role).filter(Role.id == role_id).first()
+    role = get_loaders(db).roles.load(role_id)
     if not role:
         return None
     
@@ -75,43 +76,53 @@ def update_role_permissions(
     Returns:
         True se sucesso, False se role não encontrado
     """
-    role = db.query(Role).filter(Role.id == role_id).first()
+    loaders = get_loaders(db)
+    role = loaders.roles.load(role_id)
     if not role:
         return False
     
+    # Buscar todos os módulos do payload em uma única query
+    modules = loaders.modules_by_key.load_many(
+        perm_data["module_key"] for perm_data in permissions_data if perm_data.get("module_key")
+    )
+    
+    # Permissões atuais do role, também em uma única query
+    existing = {
+        perm.module_id: perm
+        for perm in db.query(RoleModulePermission).filter(
+            RoleModulePermission.role_id == role_id,
+            RoleModulePermission.module_id.in_([module.id for module in modules.values()])
+        ).all()
+    } if modules else {}
+    
+    # Novas permissões vão em um único INSERT em lote (sem RETURNING por linha)
+    new_rows: Dict[int, Dict] = {}
+    
     # Para cada permissão no payload
     for perm_data in permissions_data:
         module_key = perm_data.get("module_key")
         if not module_key:
             continue
         
-        # Buscar módulo
-        module = db.query(Module).filter(Module.key == module_key).first()
+        module = modules.get(module_key)
         if not module:
             continue
         
-        # Buscar ou criar permissão
-        permission = db.query(RoleModulePermission).filter(
-            RoleModulePermission.role_id == role_id,
-            RoleModulePermission.module_id == module.id
-        ).first()
-        
-        if not permission:
-            permission = RoleModulePermission(
-                role_id=role_id,
-                module_id=module.id,
-                can_read=perm_data.get("can_read", False),
-                can_create=perm_data.get("can_create", False),
-                can_update=perm_data.get("can_update", False),
-                can_delete=perm_data.get("can_delete", False),
-            )
-            db.add(permission)
+        values = {
+            "can_read": perm_data.get("can_read", False),
+            "can_create": perm_data.get("can_create", False),
+            "can_update": perm_data.get("can_update", False),
+            "can_delete": perm_data.get("can_delete", False),
+        }
+        permission = existing.get(module.id)
+        if permission is None:
+            new_rows[module.id] = {"role_id": role_id, "module_id": module.id, **values}
         else:
-            permission.can_read = perm_data.get("can_read", False)
-            permission.can_create = perm_data.get("can_create", False)
-            permission.can_update = perm_data.get("can_update", False)
-            permission.can_delete = perm_data.get("can_delete", False)
+            for attribute, value in values.items():
+                setattr(permission, attribute, value)
     
+    if new_rows:
+        db.execute(insert(RoleModulePermission), list(new_rows.values()))
     db.commit()
     return True
 
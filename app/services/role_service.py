@@ -1,25 +1,34 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.role import Role
+from app.db.loaders import get_loaders
+from app.core.includes import eager_load_options
 from app.models.module import Module
 from app.models.role_module_permission import RoleModulePermission
 from app.schemas.role import RoleCreate, RoleUpdate
 
 
-def get_role(db: Session, role_id: int) -> Optional[Role]:
-    """Busca um role por ID"""
-    return db.query(Role).filter(Role.id == role_id).first()
+def get_role(db: Session, role_id: int, includes: Tuple[str, ...] = ()) -> Optional[Role]:
+    """Busca um role por ID (cache do request); `includes` carrega os relacionamentos junto"""
+    loaders = get_loaders(db)
+    if not includes:
+        return loaders.roles.load(role_id)
+    
+    role = db.query(Role).options(*eager_load_options(Role, includes)).filter(Role.id == role_id).first()
+    if role is not None:
+        loaders.roles.prime(role)
+    return role
 
 
 def get_role_by_key(db: Session, key: str) -> Optional[Role]:
-    """Busca um role por key"""
-    return db.query(Role).filter(Role.key == key).first()
+    """Busca um role por key (cache do request)"""
+    return get_loaders(db).roles_by_key.load(key)
 
 
-def get_roles(db: Session) -> List[Role]:
-    """Lista todos os roles"""
-    return db.query(Role).all()
+def get_roles(db: Session, includes: Tuple[str, ...] = ()) -> List[Role]:
+    """Lista todos os roles; `includes` carrega os relacionamentos junto"""
+    return db.query(Role).options(*eager_load_options(Role, includes)).all()
 
 
 def create_role(db: Session, role: RoleCreate) -> Role:
@@ -1,32 +1,96 @@
 from typing import Optional, Tuple, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import func, literal, select, union_all
 
 from app.models.user import User
+from app.db.loaders import get_loaders
+from app.core.fields import load_only_fields
+from app.core.includes import eager_load_options
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
 
 
-def get_user(db: Session, user_id: int) -> User | None:
-    """Busca um usuário por ID"""
-    return db.query(User).filter(User.id == user_id).first()
+def get_user(
+    db: Session,
+    user_id: int,
+    includes: Tuple[str, ...] = (),
+    fields: Optional[Tuple[str, ...]] = None
+) -> User | None:
+    """
+    Busca um usuário por ID (cache do request); `includes` carrega os
+    relacionamentos junto e `fields` carrega só as colunas desses campos.
+    Linhas parciais não entram no cache (outros services esperam a linha completa).
+    """
+    loaders = get_loaders(db)
+    if not includes and not fields:
+        return loaders.users.load(user_id)
+    
+    query = db.query(User)
+    if fields:
+        query = query.options(load_only_fields(User, fields))
+    if includes:
+        query = query.options(*eager_load_options(User, includes))
+    user = query.filter(User.id == user_id).first()
+    if user is not None and not fields:
+        loaders.users.prime(user)
+    return user
+
+
+def get_users_by_ids(db: Session, user_ids: List[int]) -> Tuple[List[User], List[int]]:
+    """
+    Busca vários usuários por ID em uma única query (IN); usuários já
+    carregados no request não são buscados de novo.
+    
+    Returns:
+        Tupla (usuários na ordem dos ids informados, ids não encontrados).
+        Ids repetidos são considerados uma vez.
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    found = get_loaders(db).users.load_many(unique_ids)
+    users = [found[user_id] for user_id in unique_ids if user_id in found]
+    missing_ids = [user_id for user_id in unique_ids if user_id not in found]
+    return users, missing_ids
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
-    """Busca um usuário por email"""
-    return db.query(User).filter(User.email == email).first()
+    """Busca um usuário por email (case-insensitive, índice em lower(email))"""
+    return db.query(User).filter(func.lower(User.email) == func.lower(email)).first()
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
-    """Busca um usuário por username"""
-    return db.query(User).filter(User.username == username).first()
+    """Busca um usuário por username (case-insensitive, índice em lower(username))"""
+    return db.query(User).filter(func.lower(User.username) == func.lower(username)).first()
 
 
-def get_user_by_email_or_username(db: Session, identifier: str) -> User | None:
-    """Busca um usuário por email ou username"""
-    return db.query(User).filter(
-        or_(User.email == identifier, User.username == identifier)
-    ).first()
+def get_user_by_email_or_username(
+    db: Session,
+    identifier: str,
+    with_role: bool = False
+) -> User | None:
+    """
+    Busca um usuário por email ou username (case-insensitive).
+    
+    Em vez de um OR (que depende do planner combinar os dois índices), são
+    duas buscas nos índices únicos de lower(email) e lower(username) unidas
+    com UNION ALL; cada uma retorna no máximo uma linha. O email tem
+    prioridade se o identificador casar com usuários diferentes.
+    
+    Args:
+        db: Sessão do banco de dados
+        identifier: Email ou username
+        with_role: Carrega o role junto (mesma query)
+    """
+    key = func.lower(identifier)
+    matches = union_all(
+        select(User.__table__, literal(0).label("match_priority")).where(func.lower(User.email) == key),
+        select(User.__table__, literal(1).label("match_priority")).where(func.lower(User.username) == key),
+    ).subquery("identifier_matches")
+    matched_user = aliased(User, matches)
+    
+    query = db.query(matched_user)
+    if with_role:
+        query = query.options(joinedload(matched_user.role))
+    return query.order_by(matches.c.match_priority).first()
 
 
 def count_users(
@@ -56,7 +120,9 @@ def get_users(
     per_page: int = 10,
     email: Optional[str] = None,
     username: Optional[str] = None,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+    includes: Tuple[str, ...] = ()
 ) -> Tuple[List[User], int]:
     """
     Lista usuários com paginação e filtros
@@ -68,6 +134,8 @@ def get_users(
         email: Filtrar por email (busca parcial, case-insensitive)
         username: Filtrar por username (busca parcial, case-insensitive)
         is_active: Filtrar por status ativo
+        fields: Carrega apenas as colunas desses campos (sparse fieldset)
+        includes: Relacionamentos carregados junto (ex.: "role", "role.permissions")
     
     Returns:
         Tupla (lista de usuários, total de registros)
@@ -89,6 +157,10 @@ def get_users(
     
     # Aplicar paginação
     skip = (page - 1) * per_page
+    if fields:
+        query = query.options(load_only_fields(User, fields))
+    if includes:
+        query = query.options(*eager_load_options(User, includes))
     users = query.offset(skip).limit(per_page).all()
     
     return users, total
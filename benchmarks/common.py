@@ -0,0 +1,211 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+- configure_environment: define as variáveis de ambiente mínimas (antes de
+  importar `app`, já que Settings é instanciado no import).
+- seed_dataset: cria o schema pelas migrations (alembic upgrade head, o mesmo
+  de produção) e popula usuários, roles, módulos e permissões com tamanhos
+  configuráveis, de forma determinística.
+- percentiles / compare_with_baseline: estatística e comparação com baseline.
+"""
+import json
+import os
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+BENCH_PASSWORD = "bench-password"
+ADMIN_USERNAME = "bench_admin"
+USER_USERNAME = "bench_user"
+
+
+def configure_environment(database_url: str, **overrides: str) -> Dict[str, str]:
+    """Define as variáveis de ambiente do app para o benchmark e as retorna"""
+    values = {
+        "APP_ENV": "benchmark",
+        "DATABASE_URL": database_url,
+        "JWT_SECRET_KEY": "benchmark-secret",
+        "DEBUG": "False",
+        "DB_ECHO": "False",
+        "SQL_QUERY_COUNT_HEADER": "True",
+        "SQL_QUERY_BUDGET": "0",
+        "LOOP_WATCHDOG_ENABLED": "False",
+    }
+    values.update(overrides)
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    return {key: os.environ[key] for key in values}
+
+
+def seed_dataset(
+    database_url: str,
+    users: int,
+    roles: int,
+    modules: int,
+    batch_size: int = 5000
+) -> Dict[str, int]:
+    """
+    Recria o schema pelas migrations e popula um dataset sintético.
+
+    O schema vem do `alembic upgrade head`, não do metadata dos models: os
+    índices medidos (e verificados por query_plans) são os que as migrations
+    criam em produção.
+
+    - roles de sistema (SUPER_ADMIN, ADMIN, USER) + `roles` roles sintéticas
+    - módulos do MODULES_REGISTRY + módulos sintéticos até `modules`
+    - permissões: USER lê todos os módulos; roles sintéticas têm matriz completa
+    - `users` usuários (todos com a mesma senha, hash calculado uma vez), mais
+      um Super Admin (bench_admin) e um usuário comum (bench_user)
+
+    Retorna ids úteis para os cenários.
+    """
+    from sqlalchemy import create_engine, insert, select, text
+
+    from app.core.modules_registry import MODULES_REGISTRY
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.db.migrations import upgrade_to_head
+    from app.models import Module, Role, RoleModulePermission, User
+
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    upgrade_to_head(engine)
+
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+
+    with engine.begin() as conn:
+        role_rows = [
+            {"key": "SUPER_ADMIN", "name": "Super Administrador", "description": None, "is_system": True},
+            {"key": "ADMIN", "name": "Administrador", "description": None, "is_system": False},
+            {"key": "USER", "name": "Usuário", "description": None, "is_system": False},
+        ]
+        role_rows += [
+            {"key": f"BENCH_ROLE_{index}", "name": f"Bench role {index}", "description": None, "is_system": False}
+            for index in range(roles)
+        ]
+        conn.execute(insert(Role), role_rows)
+
+        module_rows = [dict(module, description=module.get("description")) for module in MODULES_REGISTRY]
+        module_rows += [
+            {"key": f"bench_module_{index}", "name": f"Bench module {index}", "description": None}
+            for index in range(max(modules - len(MODULES_REGISTRY), 0))
+        ]
+        conn.execute(insert(Module), module_rows)
+
+        role_ids = dict(conn.execute(select(Role.key, Role.id)).all())
+        module_ids = [row[0] for row in conn.execute(select(Module.id)).all()]
+
+        permission_rows = [
+            {"role_id": role_ids["USER"], "module_id": module_id, "can_read": True,
+             "can_create": False, "can_update": False, "can_delete": False}
+            for module_id in module_ids
+        ]
+        for index in range(roles):
+            role_id = role_ids[f"BENCH_ROLE_{index}"]
+            permission_rows += [
+                {"role_id": role_id, "module_id": module_id, "can_read": True,
+                 "can_create": index % 2 == 0, "can_update": index % 3 == 0, "can_delete": False}
+                for module_id in module_ids
+            ]
+        for start in range(0, len(permission_rows), batch_size):
+            conn.execute(insert(RoleModulePermission), permission_rows[start:start + batch_size])
+
+        def user_row(username: str, role_id: int) -> dict:
+            return {
+                "email": f"{username}@bench.example.com",
+                "username": username,
+                "hashed_password": hashed_password,
+                "full_name": username.replace("_", " ").title(),
+                "is_active": True,
+                "can_access_system": True,
+                "is_superuser": False,
+                "role_id": role_id,
+            }
+
+        conn.execute(insert(User), [
+            user_row(ADMIN_USERNAME, role_ids["SUPER_ADMIN"]),
+            user_row(USER_USERNAME, role_ids["USER"]),
+        ])
+        synthetic_role_ids = [role_ids[f"BENCH_ROLE_{index}"] for index in range(roles)] or [role_ids["USER"]]
+        for start in range(0, users, batch_size):
+            conn.execute(insert(User), [
+                user_row(f"user{index}", synthetic_role_ids[index % len(synthetic_role_ids)])
+                for index in range(start, min(start + batch_size, users))
+            ])
+
+    engine.dispose()
+    return {
+        "bench_role_id": role_ids.get("BENCH_ROLE_0", role_ids["USER"]),
+        "user_role_id": role_ids["USER"],
+        "modules": len(module_ids),
+    }
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = (50, 95, 99)) -> Dict[str, float]:
+    """Percentis pelo método nearest-rank"""
+    if not values:
+        return {f"p{point}": 0.0 for point in points}
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        rank = max(int(round(point / 100 * len(ordered) + 0.5)) - 1, 0)
+        result[f"p{point}"] = ordered[min(rank, len(ordered) - 1)]
+    return result
+
+
+def environment_info() -> Dict[str, Optional[str]]:
+    """Informações do ambiente para reprodutibilidade dos resultados"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": str(os.cpu_count()),
+        "commit": commit,
+    }
+
+
+def write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
+def compare_with_baseline(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    higher_is_better: Sequence[str],
+    lower_is_better: Sequence[str],
+    threshold: float
+) -> List[str]:
+    """
+    Compara métricas por cenário com o baseline.
+
+    Retorna a lista de regressões (variação pior que `threshold`, em fração).
+    """
+    regressions = []
+    for name, metrics in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in higher_is_better:
+            if base.get(key) and metrics.get(key) is not None:
+                change = (metrics[key] - base[key]) / base[key]
+                if change < -threshold:
+                    regressions.append(f"{name}.{key}: {base[key]:.2f} -> {metrics[key]:.2f} ({change:+.1%})")
+        for key in lower_is_better:
+            if base.get(key) and metrics.get(key) is not None:
+                change = (metrics[key] - base[key]) / base[key]
+                if change > threshold:
+                    regressions.append(f"{name}.{key}: {base[key]:.2f} -> {metrics[key]:.2f} ({change:+.1%})")
+    return regressions
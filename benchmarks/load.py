@@ -0,0 +1,371 @@
+"""
+Benchmark de carga HTTP dos endpoints mais usados.
+
+Sobe a aplicação com uvicorn contra um banco local (SQLite por padrão),
+popula um dataset sintético e executa cada cenário com concorrência fixa,
+medindo throughput, latência (p50/p95/p99) e statements SQL por request
+(header X-DB-Query-Count). O resultado pode ser comparado com um baseline.
+
+Uso:
+    python -m benchmarks.load
+    python -m benchmarks.load --users 50000 --concurrency 16 --duration 20
+    python -m benchmarks.load --scenarios me users_list --save-baseline
+    python -m benchmarks.load --baseline benchmarks/results/load-baseline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import (
+    ADMIN_USERNAME,
+    BENCH_PASSWORD,
+    RESULTS_DIR,
+    ROOT_DIR,
+    USER_USERNAME,
+    compare_with_baseline,
+    configure_environment,
+    environment_info,
+    percentiles,
+    seed_dataset,
+    write_json,
+)
+
+DEFAULT_BASELINE = RESULTS_DIR / "load-baseline.json"
+
+Request = Tuple[str, str, Optional[dict], Optional[str]]
+
+
+class Context:
+    """Dados compartilhados pelos cenários (tokens, ids e tamanhos do dataset)"""
+
+    def __init__(self, users: int, bench_role_id: int, module_keys: List[str]):
+        self.users = users
+        self.bench_role_id = bench_role_id
+        self.module_keys = module_keys
+        self.admin_token: Optional[str] = None
+        self.user_token: Optional[str] = None
+
+    def username(self, index: int) -> str:
+        return f"user{index % max(self.users, 1)}" if self.users else USER_USERNAME
+
+    def permission_matrix(self, index: int) -> dict:
+        return {
+            "permissions": [
+                {
+                    "module_key": key,
+                    "can_read": True,
+                    "can_create": index % 2 == 0,
+                    "can_update": False,
+                    "can_delete": False,
+                }
+                for key in self.module_keys
+            ]
+        }
+
+
+def _scenario_login(ctx: Context, index: int) -> Request:
+    return "POST", "/api/v1/auth/login", {"username": ctx.username(index), "password": BENCH_PASSWORD}, None
+
+
+def _scenario_me(ctx: Context, index: int) -> Request:
+    return "GET", "/api/v1/auth/me", None, ctx.user_token
+
+
+def _scenario_users_list(ctx: Context, index: int) -> Request:
+    pages = max(ctx.users // 20, 1)
+    return "GET", f"/api/v1/users/?page={index % pages + 1}&perPage=20", None, ctx.user_token
+
+
+def _scenario_users_list_fields(ctx: Context, index: int) -> Request:
+    pages = max(ctx.users // 20, 1)
+    return "GET", f"/api/v1/users/?page={index % pages + 1}&perPage=20&fields=id,username,email", None, ctx.user_token
+
+
+def _scenario_users_list_include(ctx: Context, index: int) -> Request:
+    pages = max(ctx.users // 20, 1)
+    return "GET", f"/api/v1/users/?page={index % pages + 1}&perPage=20&include=role", None, ctx.user_token
+
+
+def _scenario_users_filter(ctx: Context, index: int) -> Request:
+    return "GET", f"/api/v1/users/?username=user{index % 100}&is_active=true", None, ctx.user_token
+
+
+def _scenario_users_batch_get(ctx: Context, index: int) -> Request:
+    # 50 ids consecutivos, como uma lista de responsáveis; a janela dá a volta
+    # em ctx.users para que todos existam (ids 1..ctx.users)
+    total = max(ctx.users, 1)
+    start = index * 50
+    ids = [(start + offset) % total + 1 for offset in range(50)]
+    return "POST", "/api/v1/users/batch-get", {"ids": ids}, ctx.user_token
+
+
+def _scenario_role_matrix_read(ctx: Context, index: int) -> Request:
+    return "GET", f"/api/v1/access/roles/{ctx.bench_role_id}/permissions", None, ctx.admin_token
+
+
+def _scenario_role_matrix_write(ctx: Context, index: int) -> Request:
+    return (
+        "PUT",
+        f"/api/v1/access/roles/{ctx.bench_role_id}/permissions",
+        ctx.permission_matrix(index),
+        ctx.admin_token,
+    )
+
+
+def _scenario_access_roles(ctx: Context, index: int) -> Request:
+    # Usuário comum: passa por has_permission (sem bypass de Super Admin)
+    return "GET", "/api/v1/access/roles", None, ctx.user_token
+
+
+SCENARIOS: Dict[str, Callable[[Context, int], Request]] = {
+    "login": _scenario_login,
+    "me": _scenario_me,
+    "users_list": _scenario_users_list,
+    "users_list_fields": _scenario_users_list_fields,
+    "users_list_include": _scenario_users_list_include,
+    "users_filter": _scenario_users_filter,
+    "users_batch_get": _scenario_users_batch_get,
+    "role_matrix_read": _scenario_role_matrix_read,
+    "role_matrix_write": _scenario_role_matrix_write,
+    "access_roles": _scenario_access_roles,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(conn: http.client.HTTPConnection, request: Request) -> Tuple[int, Optional[str], bytes]:
+    method, path, body, token = request
+    headers = {"Accept": "application/json"}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body)
+        headers["Content-Type"] = "application/json"
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    conn.request(method, path, body=payload, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, response.getheader("X-DB-Query-Count"), data
+
+
+def start_server(env: Dict[str, str], port: int) -> subprocess.Popen:
+    """Sobe o uvicorn com um worker e espera o /health responder"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT_DIR,
+        env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready in 30s")
+
+
+def login(port: int, username: str) -> str:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    status, _, data = _request(
+        conn, ("POST", "/api/v1/auth/login", {"username": username, "password": BENCH_PASSWORD}, None)
+    )
+    if status != 200:
+        raise RuntimeError(f"Login failed for {username}: {status} {data[:200]!r}")
+    return json.loads(data)["access_token"]
+
+
+def run_scenario(
+    name: str,
+    ctx: Context,
+    port: int,
+    concurrency: int,
+    duration: float,
+    warmup: float
+) -> dict:
+    """Executa um cenário com `concurrency` clientes keep-alive durante `duration` segundos"""
+    build_request = SCENARIOS[name]
+    latencies: List[float] = []
+    statements: List[int] = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(10 ** 12))
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        local_latencies, local_statements, local_errors = [], [], 0
+        while True:
+            with lock:
+                index = next(counter)
+            request = build_request(ctx, index)
+            began = time.perf_counter()
+            if began >= stop_at:
+                break
+            try:
+                status, query_count, _ = _request(conn, request)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                status, query_count = 0, None
+            elapsed = time.perf_counter() - began
+            if began < start_at:
+                continue  # aquecimento
+            local_latencies.append(elapsed)
+            if status >= 400 or status == 0:
+                local_errors += 1
+            if query_count is not None:
+                local_statements.append(int(query_count))
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            statements.extend(local_statements)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latency_ms = {key: value * 1000 for key, value in percentiles(latencies).items()}
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "throughput_rps": len(latencies) / duration,
+        "latency_ms": {
+            **latency_ms,
+            "mean": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+            "max": max(latencies) * 1000 if latencies else 0.0,
+        },
+        "db_statements_per_request": (sum(statements) / len(statements)) if statements else None,
+    }
+
+
+def _flatten(results: Dict[str, dict]) -> Dict[str, Dict[str, float]]:
+    return {
+        name: {
+            "throughput_rps": result["throughput_rps"],
+            "p95_ms": result["latency_ms"]["p95"],
+            "p99_ms": result["latency_ms"]["p99"],
+            "db_statements_per_request": result["db_statements_per_request"],
+        }
+        for name, result in results.items()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTTP load benchmark for the hot endpoints")
+    parser.add_argument("--database-url", help="Banco a usar (padrão: SQLite temporário)")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos medidos por cenário")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Segundos de aquecimento por cenário")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de resultado")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Grava o resultado como baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Regressão tolerada (fração)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-load-")
+    database_url = args.database_url or f"sqlite:///{tmp_dir}/bench.db"
+    env = configure_environment(database_url)
+
+    print(f"Seeding {args.users} users, {args.roles} roles, {args.modules} modules...")
+    seeded = seed_dataset(database_url, args.users, args.roles, args.modules)
+
+    from app.core.modules_registry import MODULES_REGISTRY
+    module_keys = [module["key"] for module in MODULES_REGISTRY] + [
+        f"bench_module_{index}" for index in range(max(args.modules - len(MODULES_REGISTRY), 0))
+    ]
+    ctx = Context(args.users, seeded["bench_role_id"], module_keys)
+
+    port = _free_port()
+    server = start_server(env, port)
+    try:
+        ctx.admin_token = login(port, ADMIN_USERNAME)
+        ctx.user_token = login(port, USER_USERNAME)
+
+        results = {}
+        for name in args.scenarios:
+            print(f"Running {name} (concurrency={args.concurrency}, {args.duration}s)...")
+            results[name] = run_scenario(name, ctx, port, args.concurrency, args.duration, args.warmup)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    report = {
+        "meta": {
+            **environment_info(),
+            "database": database_url.split(":", 1)[0],
+            "users": args.users,
+            "roles": args.roles,
+            "modules": args.modules,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+        },
+        "scenarios": results,
+    }
+
+    print(f"\n{'scenario':<20}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>10}{'errors':>8}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        sql = result["db_statements_per_request"]
+        print(
+            f"{name:<20}{result['throughput_rps']:>10.1f}{latency['p50']:>10.2f}"
+            f"{latency['p95']:>10.2f}{latency['p99']:>10.2f}"
+            f"{(f'{sql:.1f}' if sql is not None else '-'):>10}{result['errors']:>8}"
+        )
+
+    output = args.output or RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_json(output, report)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_with_baseline(
+            _flatten(results),
+            _flatten(baseline.get("scenarios", {})),
+            higher_is_better=["throughput_rps"],
+            lower_is_better=["p95_ms", "p99_ms", "db_statements_per_request"],
+            threshold=args.threshold,
+        )
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Microbenchmarks das funções executadas em todo request.
+
+Cobre app.core.security (hash/verificação de senha e JWT), get_pagination_meta
+e a construção dos envelopes de resposta (list_response/get_response) com 1,
+10, 100 e 1000 itens, além da serialização pelo response_model (completa e
+com sparse fieldset).
+
+Para cada benchmark:
+- ops/s: o número de chamadas por rodada é calibrado para que cada rodada
+  dure pelo menos --min-time; são feitas --rounds rodadas com o GC desligado
+  (como no timeit) e a mediana é usada como valor principal;
+- alocações: com tracemalloc, mede o pico de memória alocada por chamada e o
+  que fica retido após a chamada (bytes e blocos).
+
+Uso:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter list_response --rounds 10
+    python -m benchmarks.micro --save-baseline
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import (
+    RESULTS_DIR,
+    compare_with_baseline,
+    configure_environment,
+    environment_info,
+    write_json,
+)
+
+DEFAULT_BASELINE = RESULTS_DIR / "micro-baseline.json"
+SIZES = (1, 10, 100, 1000)
+
+Benchmark = Tuple[str, Callable[[], object]]
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """Monta a lista (nome, função sem argumentos) dos benchmarks"""
+    from app.core.fields import sparse_schema
+    from app.core.pagination import get_pagination_meta
+    from app.core.responses import get_response, list_response, schema_response
+    from app.core.security import (
+        create_access_token,
+        decode_access_token,
+        get_password_hash,
+        verify_password,
+    )
+    from app.models import User as UserModel
+    from app.schemas.response import GetResponse, ListResponse
+    from app.schemas.user import User
+
+    password = "bench-password"
+    hashed = get_password_hash(password)
+    token = create_access_token({"sub": "bench_user"})
+
+    benchmarks: List[Benchmark] = [
+        ("security.verify_password", lambda: verify_password(password, hashed)),
+        ("security.verify_password_mismatch", lambda: verify_password("wrong-password", hashed)),
+        ("security.get_password_hash", lambda: get_password_hash(password)),
+        ("security.create_access_token", lambda: create_access_token({"sub": "bench_user"})),
+        ("security.create_access_token_expires", lambda: create_access_token(
+            {"sub": "bench_user"}, expires_delta=timedelta(minutes=5)
+        )),
+        ("security.decode_access_token", lambda: decode_access_token(token)),
+        ("security.decode_access_token_invalid", lambda: decode_access_token(token + "x")),
+        ("pagination.get_pagination_meta", lambda: get_pagination_meta(1000, 3, 20)),
+        ("pagination.get_pagination_meta_empty", lambda: get_pagination_meta(0, 1, 20)),
+    ]
+
+    now = datetime(2024, 1, 1)
+
+    def make_users(count: int) -> List[UserModel]:
+        # Instâncias transientes, como as retornadas pelos services
+        return [
+            UserModel(
+                id=index,
+                email=f"user{index}@bench.example.com",
+                username=f"user{index}",
+                full_name=f"User {index}",
+                is_active=True,
+                can_access_system=True,
+                is_superuser=False,
+                role_id=1,
+                created_at=now,
+            )
+            for index in range(count)
+        ]
+
+    list_model = ListResponse[User]
+    get_model = GetResponse[List[User]]
+
+    for size in SIZES:
+        users = make_users(size)
+
+        def build_list(users=users, size=size):
+            return list_response(items=users, total=size * 10, page=2, per_page=size)
+
+        def build_get(users=users):
+            return get_response(data=users)
+
+        def serialize_list(build_list=build_list):
+            # Validação pelo response_model (from_attributes) + JSON, como no FastAPI
+            envelope = build_list()
+            return list_model.model_validate(envelope.model_dump(), from_attributes=True).model_dump_json()
+
+        def serialize_get(build_get=build_get):
+            envelope = build_get()
+            return get_model.model_validate(envelope.model_dump(), from_attributes=True).model_dump_json()
+
+        def serialize_list_sparse(build_list=build_list):
+            # ?fields=id,username,email (schema reduzido cacheado)
+            return schema_response(build_list(), sparse_schema(User, ("username", "email", "id"))).body
+
+        benchmarks += [
+            (f"responses.list_response[{size}]", build_list),
+            (f"responses.get_response[{size}]", build_get),
+            (f"responses.list_response_serialize[{size}]", serialize_list),
+            (f"responses.list_response_serialize_sparse[{size}]", serialize_list_sparse),
+            (f"responses.get_response_serialize[{size}]", serialize_get),
+        ]
+
+    return benchmarks
+
+
+def _calibrate(func: Callable[[], object], min_time: float) -> int:
+    """Menor número de chamadas (1, 2, 5, 10, 20, ...) que dura pelo menos min_time"""
+    loops = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            number = loops * multiplier
+            if _timed_round(func, number) >= min_time:
+                return number
+        loops *= 10
+
+
+def _timed_round(func: Callable[[], object], number: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure_speed(func: Callable[[], object], rounds: int, min_time: float) -> dict:
+    number = _calibrate(func, min_time)
+    per_call = [_timed_round(func, number) / number for _ in range(rounds)]
+    median = statistics.median(per_call)
+    return {
+        "ops_per_sec": 1 / median,
+        "ns_per_op": median * 1e9,
+        "ns_per_op_min": min(per_call) * 1e9,
+        "ns_per_op_max": max(per_call) * 1e9,
+        "ns_per_op_stdev": (statistics.stdev(per_call) if rounds > 1 else 0.0) * 1e9,
+        "rounds": rounds,
+        "calls_per_round": number,
+    }
+
+
+def measure_allocations(func: Callable[[], object], calls: int) -> dict:
+    """Pico alocado por chamada e memória retida (bytes/blocos) após as chamadas"""
+    func()  # caches de import/validators fora da medição
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            del result
+        gc.collect()
+        snapshot_before = tracemalloc.take_snapshot()
+        retained = [func() for _ in range(calls)]
+        snapshot_after = tracemalloc.take_snapshot()
+        del retained
+    finally:
+        tracemalloc.stop()
+
+    diff = snapshot_after.compare_to(snapshot_before, "filename")
+    return {
+        "peak_bytes_per_call": statistics.median(peaks),
+        "result_bytes_per_call": sum(stat.size_diff for stat in diff) / calls,
+        "result_blocks_per_call": sum(stat.count_diff for stat in diff) / calls,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for security and response helpers")
+    parser.add_argument("--filter", nargs="+", help="Executa apenas benchmarks cujo nome contém um dos termos")
+    parser.add_argument("--rounds", type=int, default=7, help="Rodadas por benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duração mínima de cada rodada (s)")
+    parser.add_argument("--alloc-calls", type=int, default=20, help="Chamadas medidas com tracemalloc")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de resultado")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Grava o resultado como baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regressão tolerada (fração)")
+    args = parser.parse_args()
+
+    # Nenhum benchmark acessa o banco; a URL só satisfaz as Settings
+    configure_environment("sqlite://")
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = [(name, func) for name, func in benchmarks if any(term in name for term in args.filter)]
+
+    results: Dict[str, dict] = {}
+    print(f"{'benchmark':<45}{'ops/s':>14}{'ns/op':>14}{'±stdev':>10}{'peak B':>12}{'blocks':>9}")
+    for name, func in benchmarks:
+        result = {**measure_speed(func, args.rounds, args.min_time),
+                  **measure_allocations(func, args.alloc_calls)}
+        results[name] = result
+        print(
+            f"{name:<45}{result['ops_per_sec']:>14,.1f}{result['ns_per_op']:>14,.0f}"
+            f"{result['ns_per_op_stdev'] / result['ns_per_op']:>9.1%} "
+            f"{result['peak_bytes_per_call']:>11,.0f}{result['result_blocks_per_call']:>9.1f}"
+        )
+
+    report = {
+        "meta": {**environment_info(), "rounds": args.rounds, "min_time": args.min_time},
+        "benchmarks": results,
+    }
+    output = args.output or RESULTS_DIR / f"micro-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_json(output, report)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_with_baseline(
+            results,
+            baseline.get("benchmarks", {}),
+            higher_is_better=["ops_per_sec"],
+            lower_is_better=["peak_bytes_per_call"],
+            threshold=args.threshold,
+        )
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
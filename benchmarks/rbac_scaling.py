@@ -0,0 +1,315 @@
+"""
+Benchmark de escala do RBAC (roles x módulos).
+
+Para cada ponto da varredura um banco novo é criado com `modules` módulos
+(sincronizados a partir de um MODULES_REGISTRY sintético) e `roles` roles,
+cada uma com a matriz de permissões preenchida segundo --density. São medidos:
+
+- sync_modules_from_registry: banco vazio (insert) e repetido (idempotente);
+- has_permission: latência (p50/p95/p99) para um usuário comum, módulos
+  sorteados;
+- get_role_permission_matrix: latência e tamanho do payload JSON da rota;
+- update_role_permissions: latência com o payload da matriz completa;
+- statements SQL por operação em todos os casos.
+
+Por padrão são feitas duas varreduras: módulos (10 → 10k, roles fixas) e
+roles (10 → 5k, módulos fixos). Com --grid é feito o produto cartesiano.
+Os resultados são gravados em JSON e, se o matplotlib estiver instalado,
+plotados como curvas de escala (PNG).
+
+Uso:
+    python -m benchmarks.rbac_scaling
+    python -m benchmarks.rbac_scaling --modules 10 100 1000 --roles 10 100
+    python -m benchmarks.rbac_scaling --grid --modules 10 1000 --roles 10 1000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.common import (
+    RESULTS_DIR,
+    configure_environment,
+    environment_info,
+    percentiles,
+    write_json,
+)
+
+DEFAULT_MODULES = (10, 100, 1000, 10000)
+DEFAULT_ROLES = (10, 100, 1000, 5000)
+
+
+def synthetic_registry(size: int) -> List[Dict[str, str]]:
+    return [
+        {"key": f"module_{index}", "name": f"Module {index}", "description": f"Synthetic module {index}"}
+        for index in range(size)
+    ]
+
+
+@contextmanager
+def patched_registry(registry: List[Dict[str, str]]) -> Iterator[None]:
+    """Substitui o MODULES_REGISTRY usado por sync_modules_from_registry"""
+    from app.services import module_service
+
+    original = module_service.MODULES_REGISTRY
+    module_service.MODULES_REGISTRY = registry
+    try:
+        yield
+    finally:
+        module_service.MODULES_REGISTRY = original
+
+
+def timed(func: Callable[[], object]) -> Tuple[float, int, object]:
+    """Executa `func` e retorna (segundos, statements SQL, resultado)"""
+    from app.core.instrumentation import count_queries
+
+    with count_queries() as stats:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    return elapsed, stats.db_statements, result
+
+
+def _latency_summary(samples: List[float], statements: List[int]) -> dict:
+    summary = {key: value * 1000 for key, value in percentiles(samples).items()}
+    summary["mean"] = statistics.mean(samples) * 1000
+    summary["statements"] = statistics.mean(statements)
+    return summary
+
+
+def run_point(
+    database_url: str,
+    modules: int,
+    roles: int,
+    density: float,
+    permission_checks: int,
+    matrix_repeat: int,
+    update_repeat: int,
+    batch_size: int,
+    seed: int
+) -> dict:
+    """Cria o dataset de um ponto da varredura e mede as operações"""
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.instrumentation import instrument_engine
+    from app.core.responses import get_response
+    from app.db.base import Base
+    from app.models import Module, Role, RoleModulePermission, User
+    from app.schemas.permission import RolePermissionMatrix
+    from app.schemas.response import GetResponse
+    from app.services.authz_service import has_permission
+    from app.services.module_service import sync_modules_from_registry
+    from app.services.permission_service import get_role_permission_matrix, update_role_permissions
+
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    instrument_engine(engine)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    result: Dict[str, object] = {"modules": modules, "roles": roles}
+
+    registry = synthetic_registry(modules)
+    with patched_registry(registry), Session() as db:
+        seconds, statements, _ = timed(lambda: sync_modules_from_registry(db))
+        result["sync_insert"] = {"ms": seconds * 1000, "statements": statements}
+        seconds, statements, _ = timed(lambda: sync_modules_from_registry(db))
+        result["sync_noop"] = {"ms": seconds * 1000, "statements": statements}
+
+    with engine.begin() as conn:
+        conn.execute(insert(Role), [
+            {"key": f"ROLE_{index}", "name": f"Role {index}", "description": None, "is_system": False}
+            for index in range(roles)
+        ])
+        role_ids = [row[0] for row in conn.execute(select(Role.id).order_by(Role.id)).all()]
+        module_ids = [row[0] for row in conn.execute(select(Module.id)).all()]
+        per_role = max(int(len(module_ids) * density), 1)
+        rows: List[dict] = []
+        for role_id in role_ids:
+            for module_id in rng.sample(module_ids, per_role):
+                rows.append({
+                    "role_id": role_id, "module_id": module_id, "can_read": True,
+                    "can_create": rng.random() < 0.5, "can_update": rng.random() < 0.3, "can_delete": False,
+                })
+                if len(rows) >= batch_size:
+                    conn.execute(insert(RoleModulePermission), rows)
+                    rows = []
+        if rows:
+            conn.execute(insert(RoleModulePermission), rows)
+        target_role_id = role_ids[len(role_ids) // 2]
+        conn.execute(insert(User), [{
+            "email": "rbac@bench.example.com", "username": "rbac_user", "hashed_password": "x",
+            "is_active": True, "can_access_system": True, "is_superuser": False, "role_id": target_role_id,
+        }])
+
+    module_keys = [module["key"] for module in registry]
+
+    with Session() as db:
+        user = db.query(User).filter(User.username == "rbac_user").one()
+        user.role  # carrega a role antes das medições
+        samples, statement_counts = [], []
+        for _ in range(permission_checks):
+            key = rng.choice(module_keys)
+            action = rng.choice(("read", "create", "update", "delete"))
+            seconds, statements, _ = timed(lambda: has_permission(db, user, key, action))
+            samples.append(seconds)
+            statement_counts.append(statements)
+        result["has_permission"] = _latency_summary(samples, statement_counts)
+
+    response_model = GetResponse[RolePermissionMatrix]
+    with Session() as db:
+        samples, statement_counts = [], []
+        for _ in range(matrix_repeat):
+            db.expunge_all()
+            seconds, statements, matrix = timed(lambda: get_role_permission_matrix(db, target_role_id))
+            samples.append(seconds)
+            statement_counts.append(statements)
+        envelope = get_response(data=matrix)
+        start = time.perf_counter()
+        payload = response_model.model_validate(envelope.model_dump(), from_attributes=True).model_dump_json()
+        serialize_seconds = time.perf_counter() - start
+        result["permission_matrix"] = {
+            **_latency_summary(samples, statement_counts),
+            "serialize_ms": serialize_seconds * 1000,
+            "payload_bytes": len(payload.encode()),
+        }
+
+    with Session() as db:
+        samples, statement_counts = [], []
+        for iteration in range(update_repeat):
+            payload = [
+                {"module_key": key, "can_read": True, "can_create": iteration % 2 == 0,
+                 "can_update": rng.random() < 0.5, "can_delete": False}
+                for key in module_keys
+            ]
+            db.expunge_all()
+            seconds, statements, _ = timed(lambda: update_role_permissions(db, target_role_id, payload))
+            samples.append(seconds)
+            statement_counts.append(statements)
+        result["update_role_permissions"] = _latency_summary(samples, statement_counts)
+
+    engine.dispose()
+    return result
+
+
+def plot(points: List[dict], output: Path) -> Optional[Path]:
+    """Curvas de escala por eixo (requer matplotlib)"""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+
+    series = [
+        ("has_permission p95 (ms)", lambda p: p["has_permission"]["p95"]),
+        ("permission matrix p95 (ms)", lambda p: p["permission_matrix"]["p95"]),
+        ("permission matrix payload (KiB)", lambda p: p["permission_matrix"]["payload_bytes"] / 1024),
+        ("update_role_permissions p50 (ms)", lambda p: p["update_role_permissions"]["p50"]),
+        ("sync_modules_from_registry insert (ms)", lambda p: p["sync_insert"]["ms"]),
+        ("sync_modules_from_registry no-op (ms)", lambda p: p["sync_noop"]["ms"]),
+    ]
+    axes_groups = {}
+    for point in points:
+        axes_groups.setdefault(point["axis"], []).append(point)
+
+    figure, axes = plt.subplots(len(series), len(axes_groups), figsize=(6 * len(axes_groups), 3 * len(series)),
+                                squeeze=False)
+    for column, (axis, group) in enumerate(sorted(axes_groups.items())):
+        x_key = "roles" if axis == "roles" else "modules"
+        group = sorted(group, key=lambda p: (p["roles"], p["modules"]) if x_key == "roles" else (p["modules"], p["roles"]))
+        lines: Dict[int, List[dict]] = {}
+        for point in group:
+            other = point["modules"] if x_key == "roles" else point["roles"]
+            lines.setdefault(other, []).append(point)
+        for row, (title, getter) in enumerate(series):
+            ax = axes[row][column]
+            for other, line in sorted(lines.items()):
+                label = f"{'modules' if x_key == 'roles' else 'roles'}={other}"
+                ax.plot([p[x_key] for p in line], [getter(p) for p in line], marker="o", label=label)
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.set_xlabel(x_key)
+            ax.set_title(title, fontsize=10)
+            ax.grid(True, which="both", alpha=0.3)
+            ax.legend(fontsize=8)
+    figure.tight_layout()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    figure.savefig(output, dpi=100)
+    plt.close(figure)
+    return output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="RBAC scaling benchmark (roles x modules)")
+    parser.add_argument("--database-url", help="Banco a usar (padrão: SQLite temporário; é recriado a cada ponto)")
+    parser.add_argument("--modules", type=int, nargs="+", default=list(DEFAULT_MODULES))
+    parser.add_argument("--roles", type=int, nargs="+", default=list(DEFAULT_ROLES))
+    parser.add_argument("--fixed-modules", type=int, default=10, help="Módulos na varredura de roles")
+    parser.add_argument("--fixed-roles", type=int, default=10, help="Roles na varredura de módulos")
+    parser.add_argument("--grid", action="store_true", help="Produto cartesiano roles x módulos")
+    parser.add_argument("--density", type=float, default=1.0, help="Fração dos módulos com permissão por role")
+    parser.add_argument("--permission-checks", type=int, default=500)
+    parser.add_argument("--matrix-repeat", type=int, default=20)
+    parser.add_argument("--update-repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench-rbac-")
+    database_url = args.database_url or f"sqlite:///{tmp_dir}/rbac.db"
+    configure_environment(database_url)
+
+    if args.grid:
+        plan = [("grid", modules, roles) for modules in args.modules for roles in args.roles]
+    else:
+        plan = [("modules", modules, args.fixed_roles) for modules in args.modules]
+        plan += [("roles", args.fixed_modules, roles) for roles in args.roles]
+
+    points = []
+    print(f"{'axis':<9}{'modules':>8}{'roles':>7}{'has_perm p95':>14}{'matrix p95':>12}"
+          f"{'payload KiB':>13}{'update p50':>12}{'sync ins':>10}{'sync noop':>11}")
+    for axis, modules, roles in plan:
+        point = run_point(
+            database_url, modules, roles, args.density, args.permission_checks,
+            args.matrix_repeat, args.update_repeat, args.batch_size, args.seed
+        )
+        point["axis"] = axis
+        points.append(point)
+        print(
+            f"{axis:<9}{modules:>8}{roles:>7}{point['has_permission']['p95']:>12.2f}ms"
+            f"{point['permission_matrix']['p95']:>10.2f}ms{point['permission_matrix']['payload_bytes'] / 1024:>13.1f}"
+            f"{point['update_role_permissions']['p50']:>10.0f}ms{point['sync_insert']['ms']:>8.0f}ms"
+            f"{point['sync_noop']['ms']:>9.0f}ms"
+        )
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    output = args.output or RESULTS_DIR / f"rbac-scaling-{stamp}.json"
+    write_json(output, {
+        "meta": {
+            **environment_info(),
+            "database": database_url.split(":", 1)[0],
+            "density": args.density,
+            "seed": args.seed,
+        },
+        "points": points,
+    })
+    print(f"\nResults written to {output}")
+
+    chart = plot(points, output.with_suffix(".png"))
+    if chart:
+        print(f"Scaling curves written to {chart}")
+    else:
+        print("matplotlib not installed: skipping scaling curves (pip install matplotlib)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
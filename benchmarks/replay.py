@@ -0,0 +1,267 @@
+"""
+Replay de tráfego capturado (TRAFFIC_CAPTURE_ENABLED) contra uma instância de teste.
+
+Os requests são reemitidos na ordem e com o espaçamento original (--speed 1),
+acelerados (--speed 10 = 10x mais rápido) ou o mais rápido possível
+(--speed 0), com até --concurrency requests simultâneos. Para cada rota é
+reportada a latência capturada x reproduzida e a taxa de erros, além dos
+requests cujo status mudou.
+
+Os valores mascarados na captura (senhas) são substituídos por --password, e
+cada subject capturado faz login na instância de teste para obter um token;
+a instância precisa ter os mesmos usuários (ex.: banco restaurado de um
+dump anonimizado ou seeds com senha conhecida).
+
+Uso:
+    python -m benchmarks.replay traffic/capture.jsonl --target http://127.0.0.1:8000
+    python -m benchmarks.replay traffic/*.jsonl --speed 5 --concurrency 32
+"""
+import argparse
+import http.client
+import json
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.common import BENCH_PASSWORD, RESULTS_DIR, percentiles, write_json
+
+SCRUBBED = "***"
+
+
+def load_records(paths: List[Path], limit: Optional[int]) -> Tuple[List[dict], int]:
+    """Lê as capturas em ordem de tempo; descarta requests sem corpo reproduzível"""
+    records, skipped = [], 0
+    for path in paths:
+        with path.open(encoding="utf-8") as capture:
+            for line in capture:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if "body_truncated" in record or "body_omitted" in record:
+                    skipped += 1
+                    continue
+                records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    if limit:
+        records = records[:limit]
+    return records, skipped
+
+
+def _pairs(pairs: List[List[str]]) -> List[Tuple[str, str]]:
+    # JSON não tem tuplas: urlencode exige pares como tuplas
+    return [tuple(pair) for pair in pairs]
+
+
+def restore(value, password: str):
+    """Substitui os valores mascarados pela senha da instância de teste"""
+    if isinstance(value, dict):
+        return {key: restore(item, password) for key, item in value.items()}
+    if isinstance(value, list):
+        return [restore(item, password) for item in value]
+    return password if value == SCRUBBED else value
+
+
+class Target:
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or (443 if self.https else 80)
+        self.prefix = parts.path.rstrip("/")
+
+    def connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=60)
+
+
+def build_request(record: dict, token: Optional[str], password: str) -> Tuple[str, str, Optional[bytes], dict]:
+    path = record["path"]
+    if record.get("query"):
+        path += "?" + urlencode(_pairs(restore(record["query"], password)))
+    headers = {"Accept": "application/json"}
+    body = None
+    if "json" in record:
+        body = json.dumps(restore(record["json"], password)).encode()
+        headers["Content-Type"] = "application/json"
+    elif "form" in record:
+        body = urlencode(_pairs(restore(record["form"], password))).encode()
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return record["method"], path, body, headers
+
+
+def login_subjects(target: Target, subjects: List[str], password: str) -> Dict[str, Optional[str]]:
+    tokens: Dict[str, Optional[str]] = {}
+    conn = target.connect()
+    for subject in subjects:
+        body = json.dumps({"username": subject, "password": password})
+        try:
+            conn.request("POST", f"{target.prefix}/api/v1/auth/login", body=body,
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+            tokens[subject] = json.loads(data)["access_token"] if response.status == 200 else None
+        except (OSError, http.client.HTTPException, ValueError, KeyError):
+            conn.close()
+            conn = target.connect()
+            tokens[subject] = None
+    conn.close()
+    return tokens
+
+
+def replay(
+    records: List[dict],
+    target: Target,
+    tokens: Dict[str, Optional[str]],
+    password: str,
+    speed: float,
+    concurrency: int
+) -> Tuple[List[dict], float]:
+    """Reemite os requests respeitando o agendamento; retorna resultados e atraso máximo"""
+    pending: "queue.Queue[Optional[Tuple[int, dict]]]" = queue.Queue(maxsize=concurrency * 4)
+    results: List[Optional[dict]] = [None] * len(records)
+    max_lag = [0.0]
+
+    def worker() -> None:
+        conn = target.connect()
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            index, record = item
+            method, path, body, headers = build_request(record, tokens.get(record.get("subject")), password)
+            start = time.perf_counter()
+            try:
+                conn.request(method, target.prefix + path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = target.connect()
+                status = 0
+            results[index] = {
+                "route": f"{record['method']} {record['route']}",
+                "captured_status": record["status"],
+                "captured_ms": record["duration_ms"],
+                "status": status,
+                "ms": (time.perf_counter() - start) * 1000,
+            }
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    first_ts = records[0]["ts"] if records else 0.0
+    started = time.perf_counter()
+    for index, record in enumerate(records):
+        if speed > 0:
+            due = started + (record["ts"] - first_ts) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag[0] = max(max_lag[0], -delay)
+        pending.put((index, record))
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+    return [result for result in results if result is not None], max_lag[0]
+
+
+def _is_error(status: int) -> bool:
+    return status == 0 or status >= 500
+
+
+def summarize(results: List[dict]) -> Dict[str, dict]:
+    by_route: Dict[str, List[dict]] = {}
+    for result in results:
+        by_route.setdefault(result["route"], []).append(result)
+    by_route["ALL"] = results
+
+    summary = {}
+    for route, items in by_route.items():
+        captured = percentiles([item["captured_ms"] for item in items])
+        replayed = percentiles([item["ms"] for item in items])
+        summary[route] = {
+            "requests": len(items),
+            "captured_ms": captured,
+            "replay_ms": replayed,
+            "p95_delta_pct": ((replayed["p95"] - captured["p95"]) / captured["p95"] * 100) if captured["p95"] else None,
+            "captured_error_rate": sum(_is_error(item["captured_status"]) for item in items) / len(items),
+            "replay_error_rate": sum(_is_error(item["status"]) for item in items) / len(items),
+            "status_mismatches": sum(item["status"] != item["captured_status"] for item in items),
+        }
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay captured traffic against a test instance")
+    parser.add_argument("captures", type=Path, nargs="+", help="Arquivos de captura (JSON lines)")
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="URL base da instância de teste")
+    parser.add_argument("--speed", type=float, default=1.0, help="Fator de aceleração (0 = sem espera)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests simultâneos no máximo")
+    parser.add_argument("--password", default=BENCH_PASSWORD, help="Senha dos usuários na instância de teste")
+    parser.add_argument("--limit", type=int, help="Reproduz apenas os N primeiros requests")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de resultado")
+    args = parser.parse_args()
+
+    records, skipped = load_records(args.captures, args.limit)
+    if not records:
+        print("No replayable requests found")
+        return 1
+
+    target = Target(args.target)
+    subjects = sorted({record["subject"] for record in records if record.get("subject")})
+    tokens = login_subjects(target, subjects, args.password)
+    failed_logins = [subject for subject, token in tokens.items() if token is None]
+
+    span = records[-1]["ts"] - records[0]["ts"]
+    print(f"Replaying {len(records)} requests ({skipped} skipped) spanning {span:.1f}s "
+          f"at {'max' if args.speed <= 0 else f'{args.speed:g}x'} speed, {len(subjects)} subjects")
+    if failed_logins:
+        print(f"Warning: login failed for {len(failed_logins)} subjects; their requests go unauthenticated")
+
+    started = time.perf_counter()
+    results, max_lag = replay(records, target, tokens, args.password, args.speed, args.concurrency)
+    elapsed = time.perf_counter() - started
+    summary = summarize(results)
+
+    print(f"\n{'route':<50}{'reqs':>6}{'cap p95':>10}{'rep p95':>10}{'Δp95':>8}{'cap err':>9}{'rep err':>9}{'status≠':>9}")
+    for route, item in sorted(summary.items(), key=lambda entry: (entry[0] == "ALL", -entry[1]["requests"])):
+        delta = item["p95_delta_pct"]
+        print(
+            f"{route[:49]:<50}{item['requests']:>6}{item['captured_ms']['p95']:>10.1f}"
+            f"{item['replay_ms']['p95']:>10.1f}{(f'{delta:+.0f}%' if delta is not None else '-'):>8}"
+            f"{item['captured_error_rate']:>9.1%}{item['replay_error_rate']:>9.1%}{item['status_mismatches']:>9}"
+        )
+    print(f"\nReplay took {elapsed:.1f}s; max schedule lag {max_lag * 1000:.0f}ms")
+
+    output = args.output or RESULTS_DIR / f"replay-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_json(output, {
+        "meta": {
+            "captures": [str(path) for path in args.captures],
+            "target": args.target,
+            "speed": args.speed,
+            "concurrency": args.concurrency,
+            "skipped": skipped,
+            "failed_logins": len(failed_logins),
+            "elapsed_seconds": elapsed,
+            "max_schedule_lag_ms": max_lag * 1000,
+        },
+        "routes": summary,
+    })
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Gerador de dados sintéticos em volume (usuários, roles e permissões).
+
+Popula o banco com volumes de produção (milhões de usuários) para reproduzir
+planos de execução e comportamento de paginação. Os dados são determinísticos
+para um mesmo --seed (inclusive os hashes de senha, gerados com salts
+derivados do seed).
+
+- Roles: GEN_ROLE_0000..N (criadas se não existirem), com uma matriz de
+  permissões sorteada sobre todos os módulos (substituída a cada execução).
+- Usuários: nomes/e-mails realistas, distribuição desigual entre roles,
+  ~95% ativos, datas de criação espalhadas em 5 anos. Todos usam --password;
+  os hashes vêm de um pool pré-calculado (bcrypt é caro demais por linha).
+- Carga: COPY FROM STDIN no PostgreSQL; executemany em uma transação no SQLite.
+
+Execute depois das migrations e dos seeds (roles de sistema e módulos).
+
+Uso:
+    python scripts/generate_data.py --users 1000000
+    python scripts/generate_data.py --users 10000000 --roles 200 --seed 7 --truncate-users
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+# Adicionar o diretório raiz ao path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+import bcrypt
+from sqlalchemy import create_engine, insert, select, text, delete
+
+from app.core.config import settings
+from app.models import Module, Role, RoleModulePermission
+
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+    "Karina", "Lucas", "Mariana", "Nicolas", "Olivia", "Pedro", "Rafaela", "Samuel", "Tatiana", "Vinicius",
+    "Beatriz", "Caio", "Debora", "Enzo", "Fernanda", "Gustavo", "Helena", "Igor", "Julia", "Leonardo",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+]
+EMAIL_DOMAINS = ["example.com", "example.org", "example.net", "mail.example.com", "corp.example.com"]
+
+USER_COLUMNS = (
+    "email", "username", "hashed_password", "full_name", "is_active",
+    "can_access_system", "is_superuser", "role_id", "created_at",
+)
+PERMISSION_COLUMNS = ("role_id", "module_id", "can_read", "can_create", "can_update", "can_delete")
+
+_BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+CREATED_AT_START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+CREATED_AT_SPAN_SECONDS = 5 * 365 * 24 * 3600
+SQLITE_DATETIME = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def check_environment():
+    """Bloqueia a execução em produção"""
+    app_env = settings.APP_ENV.lower()
+    db_url = str(settings.DATABASE_URL).lower()
+    if app_env in ['production', 'prod'] or 'prod' in db_url or 'production' in db_url:
+        print("❌ ERROR: This script should only be run in development environment!")
+        sys.exit(1)
+
+
+def password_hash_pool(password: str, size: int, rounds: int, rng: random.Random) -> List[str]:
+    """Hashes bcrypt da mesma senha com salts determinísticos (derivados do seed)"""
+    hashes = []
+    for _ in range(size):
+        # 22 caracteres de salt; o último só codifica 2 bits (um de ".Oeu")
+        salt_body = "".join(rng.choice(_BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+        salt = f"$2b${rounds:02d}${salt_body}".encode()
+        hashes.append(bcrypt.hashpw(password.encode("utf-8")[:72], salt).decode())
+    return hashes
+
+
+def role_weights(count: int) -> List[float]:
+    """Distribuição desigual (Zipf) dos usuários entre as roles"""
+    return [1 / (index + 1) for index in range(count)]
+
+
+def generate_users(
+    count: int,
+    start: int,
+    role_ids: Sequence[int],
+    hashes: Sequence[str],
+    rng: random.Random
+) -> Iterator[Tuple]:
+    """Gera as linhas da tabela users (na ordem de USER_COLUMNS)"""
+    weights = role_weights(len(role_ids))
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    roles_for = rng.choices
+    randint = rng.randrange
+    random_value = rng.random
+
+    for index in range(start, start + count):
+        first = FIRST_NAMES[randint(len(FIRST_NAMES))]
+        last = LAST_NAMES[randint(len(LAST_NAMES))]
+        username = f"{first.lower()}.{last.lower()}.{index}"
+        yield (
+            f"{username}@{EMAIL_DOMAINS[randint(len(EMAIL_DOMAINS))]}",
+            username,
+            hashes[index % len(hashes)],
+            f"{first} {last}",
+            random_value() < 0.95,
+            random_value() < 0.9,
+            False,
+            roles_for(role_ids, cum_weights=cumulative)[0],
+            CREATED_AT_START + timedelta(seconds=randint(CREATED_AT_SPAN_SECONDS)),
+        )
+
+
+def generate_permissions(
+    role_ids: Sequence[int],
+    module_ids: Sequence[int],
+    rng: random.Random
+) -> Iterator[Tuple]:
+    """Matriz sorteada: cada role acessa uma fração dos módulos"""
+    for role_id in role_ids:
+        coverage = rng.uniform(0.2, 1.0)
+        for module_id in module_ids:
+            if rng.random() >= coverage:
+                continue
+            yield (role_id, module_id, True, rng.random() < 0.5, rng.random() < 0.3, rng.random() < 0.1)
+
+
+def _batches(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_value(value) -> str:
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def bulk_load(engine, table: str, columns: Sequence[str], rows: Iterable[Tuple], batch_size: int) -> int:
+    """Carrega as linhas pelo caminho mais rápido do banco; retorna o total carregado"""
+    dialect = engine.dialect.name
+    raw = engine.raw_connection()
+    loaded = 0
+    start = time.perf_counter()
+    try:
+        cursor = raw.cursor()
+        for batch in _batches(rows, batch_size):
+            if dialect == "postgresql":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in batch:
+                    writer.writerow([_csv_value(value) for value in row])
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            else:
+                placeholders = ", ".join("?" if dialect == "sqlite" else "%s" for _ in columns)
+                if dialect == "sqlite":
+                    # Mesmo formato de data que o SQLAlchemy grava no SQLite
+                    batch = [
+                        tuple(value.strftime(SQLITE_DATETIME) if isinstance(value, datetime) else value
+                              for value in row)
+                        for row in batch
+                    ]
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", batch
+                )
+            loaded += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"   {table}: {loaded:,} rows ({loaded / elapsed:,.0f} rows/s)", end="\r")
+        raw.commit()
+        cursor.close()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    print()
+    return loaded
+
+
+def ensure_roles(engine, count: int) -> List[int]:
+    """Cria as roles GEN_ROLE_* que faltam e retorna os ids de todas as roles"""
+    keys = [f"GEN_ROLE_{index:04d}" for index in range(count)]
+    with engine.begin() as conn:
+        existing = set(conn.execute(select(Role.key).where(Role.key.in_(keys))).scalars())
+        missing = [
+            {"key": key, "name": f"Generated role {key[-4:]}", "description": "Role sintética", "is_system": False}
+            for key in keys if key not in existing
+        ]
+        if missing:
+            conn.execute(insert(Role), missing)
+        return list(conn.execute(select(Role.id).where(Role.key.in_(keys)).order_by(Role.id)).scalars())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic users, roles and permissions")
+    parser.add_argument("--users", type=int, default=100_000, help="Usuários a gerar")
+    parser.add_argument("--roles", type=int, default=50, help="Roles sintéticas (GEN_ROLE_*)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed dos dados (mesmo seed = mesmos dados)")
+    parser.add_argument("--password", default="changeme", help="Senha de todos os usuários gerados")
+    parser.add_argument("--hash-pool", type=int, default=16, help="Hashes distintos pré-calculados")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="Custo do bcrypt dos hashes")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Linhas por lote de COPY/INSERT")
+    parser.add_argument("--truncate-users", action="store_true", help="Apaga todos os usuários antes de gerar")
+    args = parser.parse_args()
+
+    check_environment()
+    engine = create_engine(settings.DATABASE_URL)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    print("=" * 60)
+    print(f"🧪 Generating data (seed={args.seed}) on {engine.dialect.name}")
+    print("=" * 60)
+
+    if args.truncate_users:
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                conn.execute(text("TRUNCATE TABLE users RESTART IDENTITY"))
+            else:
+                conn.execute(text("DELETE FROM users"))
+        print("✓ Users truncated")
+
+    role_ids = ensure_roles(engine, args.roles)
+    with engine.begin() as conn:
+        module_ids = list(conn.execute(select(Module.id).order_by(Module.id)).scalars())
+        conn.execute(delete(RoleModulePermission).where(RoleModulePermission.role_id.in_(role_ids)))
+    if not module_ids:
+        print("⚠️  No modules found: run the seeds first (python scripts/seed_db.py)")
+    print(f"✓ {len(role_ids)} generated roles, {len(module_ids)} modules")
+
+    loaded = bulk_load(
+        engine, "role_module_permissions", PERMISSION_COLUMNS,
+        generate_permissions(role_ids, module_ids, rng), args.batch_size
+    )
+    print(f"✓ {loaded:,} permissions loaded")
+
+    hash_start = time.perf_counter()
+    hashes = password_hash_pool(args.password, args.hash_pool, args.bcrypt_rounds, rng)
+    print(f"✓ {len(hashes)} password hashes precomputed in {time.perf_counter() - hash_start:.1f}s")
+
+    with engine.connect() as conn:
+        start_index = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM users")).scalar() + 1
+    loaded = bulk_load(
+        engine, "users", USER_COLUMNS,
+        generate_users(args.users, start_index, role_ids, hashes, rng), args.batch_size
+    )
+    print(f"✓ {loaded:,} users loaded")
+
+    # Estatísticas atualizadas para o planner refletir o novo volume
+    with engine.begin() as conn:
+        for table in ("users", "roles", "role_module_permissions"):
+            conn.execute(text(f"ANALYZE {table}"))
+    print("✓ Tables analyzed")
+
+    print("\n" + "=" * 60)
+    print(f"✅ Data generated in {time.perf_counter() - started:.1f}s")
+    print("=" * 60)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
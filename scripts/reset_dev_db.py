@@ -6,11 +6,18 @@ Este script:
 2. Executa todas as migrations
 3. Executa os seeds
 
+Com --fast, o banco é recriado a partir de um template já migrado e com os
+seeds aplicados (chaveado pela revisão head do Alembic + fingerprint dos
+seeds; reconstruído automaticamente quando eles mudam), ou, com
+--fast truncate, as tabelas são esvaziadas e os seeds reaplicados.
+
 ATENÇÃO: Este script só deve ser executado em ambiente de desenvolvimento!
 
 Uso:
     python scripts/reset_dev_db.py              # Com confirmação
     python scripts/reset_dev_db.py --yes         # Sem confirmação (útil para automação)
+    python scripts/reset_dev_db.py --yes --fast  # Clona o template (PostgreSQL/SQLite em arquivo)
+    python scripts/reset_dev_db.py --yes --fast truncate  # Esvazia as tabelas (banco já na head)
 """
 import sys
 import os
@@ -29,6 +36,7 @@ from app.core.config import settings
 from app.db.session import SessionLocal
 from app.db.base import Base
 from app.db.seeds import run_seeds
+from app.db.reset import reset_database
 
 # Criar engine para operações de DDL
 engine = create_engine(
@@ -135,7 +143,22 @@ def main():
         action='store_true',
         help='Skip confirmation prompt'
     )
+    parser.add_argument(
+        '--fast',
+        nargs='?',
+        const='template',
+        choices=['template', 'truncate'],
+        help='Fast reset: clone the migrated+seeded template (default) or truncate tables'
+    )
+    parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='With --fast template: drop templates built for other migration/seed versions '
+             '(they may still be used by other checkouts sharing the database server)'
+    )
     args = parser.parse_args()
+    if args.prune and args.fast != 'template':
+        parser.error('--prune requires --fast template')
     
     print("=" * 60)
     print("🔄 Database Reset Script - Development Environment")
@@ -156,6 +179,23 @@ def main():
         print("\n⚠️  WARNING: This will DELETE ALL DATA in the database!")
         print("   Proceeding without confirmation (--yes flag used)")
     
+    if args.fast:
+        try:
+            # Conexões do script não podem segurar o banco que será recriado
+            engine.dispose()
+            elapsed = reset_database(settings.DATABASE_URL, args.fast, prune=args.prune)
+        except Exception as e:
+            print("\n" + "=" * 60)
+            print(f"❌ ERROR: Fast database reset ({args.fast}) failed!")
+            print(f"   {e}")
+            print("=" * 60)
+            sys.exit(1)
+
+        print("\n" + "=" * 60)
+        print(f"✅ Database reset ({args.fast}) completed in {elapsed:.2f}s!")
+        print("=" * 60)
+        return
+
     try:
         # 1. Dropar todas as tabelas
         drop_all_tables()
@@ -0,0 +1,144 @@
+"""
+Configuração dos testes.
+
+As variáveis de ambiente são definidas antes de qualquer import de `app`
+(Settings é instanciado no import). Os requests são feitos direto na
+aplicação ASGI, sem cliente HTTP.
+"""
+import asyncio
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="app-tests-")
+
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TMP_DIR}/test.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("DEBUG", "False")
+os.environ.setdefault("DB_ECHO", "False")
+os.environ.setdefault("LOOP_WATCHDOG_ENABLED", "False")
+os.environ.setdefault("SQL_QUERY_COUNT_HEADER", "True")
+os.environ.setdefault("SQL_QUERY_BUDGET", "0")
+
+
+class ASGIResponse:
+    def __init__(self, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.headers = {name.decode().lower(): value.decode() for name, value in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def asgi_request(
+    app,
+    method: str,
+    path: str,
+    query_string: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[Any] = None,
+    scope_out: Optional[Dict[str, Any]] = None,
+    client: Tuple[str, int] = ("testclient", 50000),
+) -> ASGIResponse:
+    """Executa um request na aplicação ASGI e devolve a resposta (scope_out recebe o scope final)"""
+    payload = json.dumps(body).encode() if body is not None else b""
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    if body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": raw_headers,
+        "server": ("testserver", 80),
+        "client": client,
+    }
+    messages: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    if scope_out is not None:
+        scope_out.update(scope)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    content = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return ASGIResponse(start["status"], start.get("headers", []), content)
+
+
+@pytest.fixture
+def request_app():
+    """Função para executar requests ASGI (ver asgi_request)"""
+    return asgi_request
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    """Banco de teste migrado (alembic upgrade head) e com os seeds aplicados"""
+    from app.db.reset import migrate_and_seed
+    from app.db.session import engine
+
+    migrate_and_seed(engine)
+    return engine
+
+
+@pytest.fixture
+def db(migrated_db):
+    """Sessão no banco de teste; tudo que ela grava é removido ao final"""
+    from app.core.modules_registry import MODULES_REGISTRY
+    from app.db.session import SessionLocal
+    from app.models import Module, Role, RoleModulePermission, User
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.query(User).delete()
+        session.query(RoleModulePermission).delete()
+        session.query(Module).filter(
+            Module.key.notin_([module["key"] for module in MODULES_REGISTRY])
+        ).delete(synchronize_session=False)
+        session.query(Role).filter(
+            Role.key.notin_(["SUPER_ADMIN", "ADMIN", "USER"])
+        ).delete(synchronize_session=False)
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Cria um usuário com o role informado e retorna (usuário, headers com o token)"""
+    from app.core.security import create_access_token, get_password_hash
+    from app.models import Role, User
+
+    password_hash = get_password_hash("test-password")
+
+    def factory(username: str, role_key: str = "USER"):
+        role = db.query(Role).filter(Role.key == role_key).one()
+        user = User(
+            email=f"{username}@example.com",
+            username=username,
+            hashed_password=password_hash,
+            role_id=role.id,
+        )
+        db.add(user)
+        db.commit()
+        token = create_access_token({"sub": username})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return factory
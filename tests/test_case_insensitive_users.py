@@ -0,0 +1,67 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, text
+
+from app.db.migrations import alembic_config
+from app.main import app
+
+PASSWORD = "secret-password"
+
+
+def _register(request_app, email: str, username: str):
+    return request_app(app, "POST", "/api/v1/users/", body={
+        "email": email, "username": username, "password": PASSWORD,
+    })
+
+
+def _login(request_app, identifier: str):
+    return request_app(app, "POST", "/api/v1/auth/login", body={"username": identifier, "password": PASSWORD})
+
+
+def test_duplicates_differing_by_case_are_rejected(request_app, db):
+    assert _register(request_app, "b@example.com", "bee").status_code == 201
+
+    by_email = _register(request_app, "B@example.com", "other")
+    assert by_email.json()["status"] == 400
+    assert by_email.json()["errors"][0]["field"] == "email"
+
+    by_username = _register(request_app, "other@example.com", "BEE")
+    assert by_username.json()["status"] == 400
+    assert by_username.json()["errors"][0]["field"] == "username"
+
+
+@pytest.mark.parametrize("identifier", ["ADMIN@example.com", "Admin@Example.com", "ADMIN", "admin"])
+def test_login_is_case_insensitive(request_app, db, identifier):
+    assert _register(request_app, "admin@example.com", "admin").status_code == 201
+
+    response = _login(request_app, identifier)
+    assert response.status_code == 200
+
+    token = response.json()["access_token"]
+    me = request_app(app, "GET", "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json()["result"]["username"] == "admin"
+
+
+def test_migration_lists_case_variant_duplicates(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/dupes.db")
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "7d3e9a1c5b42")
+        connection.execute(text(
+            "INSERT INTO users (id, email, username, hashed_password, is_active, is_superuser, created_at) VALUES "
+            "(1, 'ana@example.com', 'ana', 'x', 1, 0, CURRENT_TIMESTAMP), "
+            "(2, 'Ana@Example.com', 'ana2', 'x', 1, 0, CURRENT_TIMESTAMP), "
+            "(3, 'bruno@example.com', 'Bruno', 'x', 1, 0, CURRENT_TIMESTAMP), "
+            "(4, 'bruno2@example.com', 'bruno', 'x', 1, 0, CURRENT_TIMESTAMP)"
+        ))
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        with pytest.raises(RuntimeError) as excinfo:
+            command.upgrade(config, "head")
+
+    message = str(excinfo.value)
+    assert "id=1 email='ana@example.com', id=2 email='Ana@Example.com'" in message
+    assert "id=3 username='Bruno', id=4 username='bruno'" in message
+    engine.dispose()
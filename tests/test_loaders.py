@@ -0,0 +1,153 @@
+"""
+Loaders por request (app/db/loaders.py): cache por sessão, invalidação e isolamento.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db.loaders import get_loaders
+from app.db.session import SessionLocal
+from app.main import app
+from app.schemas.role import RoleCreate, RoleUpdate
+from app.schemas.user import UserUpdate
+from app.services.role_service import create_role, update_role
+from app.services.user_service import get_user, update_user
+
+
+@contextmanager
+def count_statements(db):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_repeated_load_runs_one_query(db, make_user):
+    user_id = make_user("cached")[0].id
+    loaders = get_loaders(db)
+
+    with count_statements(db) as statements:
+        first = loaders.users.load(user_id)
+        second = get_user(db, user_id)
+
+    assert first is second
+    assert len(statements) == 1
+
+
+def test_load_many_fetches_only_missing_keys(db, make_user):
+    ids = [make_user(f"many_{index}")[0].id for index in range(3)]
+    loaders = get_loaders(db)
+    loaders.users.load(ids[0])
+
+    with count_statements(db) as statements:
+        found = loaders.users.load_many([ids[2], ids[0], ids[1], ids[2], 0])
+
+    assert set(found) == set(ids)
+    assert len(statements) == 1
+    assert "IN" in statements[0].upper()
+
+
+def test_prime_and_clear(db, make_user):
+    user, _ = make_user("primed")
+    db.refresh(user)
+    loaders = get_loaders(db)
+    loaders.users.prime(user)
+
+    with count_statements(db) as statements:
+        assert loaders.users.load(user.id) is user
+    assert statements == []
+
+    loaders.users.clear()
+    with count_statements(db) as statements:
+        assert loaders.users.load(user.id) is user
+    assert len(statements) == 1
+
+
+def test_update_user_is_seen_by_the_loader(db, make_user):
+    user, _ = make_user("before_update")
+    loaders = get_loaders(db)
+    loaders.users.load(user.id)
+
+    update_user(db, user.id, UserUpdate(full_name="Updated Name"))
+
+    assert loaders.users.load(user.id).full_name == "Updated Name"
+
+
+def test_deleted_user_is_not_served_from_cache(db, make_user):
+    user, _ = make_user("deleted")
+    user_id = user.id
+    loaders = get_loaders(db)
+    loaders.users.load(user_id)
+
+    db.delete(user)
+    db.commit()
+    assert loaders.users.load(user_id) is None
+
+
+def test_changed_key_is_not_served_under_the_old_key(db):
+    role = create_role(db, RoleCreate(key="LOADER_OLD", name="Loader role"))
+    loaders = get_loaders(db)
+    assert loaders.roles_by_key.load("LOADER_OLD") is role
+
+    update_role(db, role.id, RoleUpdate(key="LOADER_NEW"))
+
+    assert loaders.roles_by_key.load("LOADER_OLD") is None
+    assert loaders.roles_by_key.load("LOADER_NEW") is role
+
+
+def test_missing_key_is_not_cached(db):
+    loaders = get_loaders(db)
+    assert loaders.roles_by_key.load("LOADER_LATE") is None
+
+    role = create_role(db, RoleCreate(key="LOADER_LATE", name="Created later"))
+
+    assert loaders.roles_by_key.load("LOADER_LATE") is role
+
+
+def test_loaders_are_isolated_between_sessions(db, make_user):
+    user, _ = make_user("isolated")
+    loaders = get_loaders(db)
+    loaders.users.load(user.id)
+
+    other = SessionLocal()
+    try:
+        other_loaders = get_loaders(other)
+        assert other_loaders is not loaders
+        assert other_loaders.users._cache == {}
+
+        with count_statements(other) as statements:
+            other_user = other_loaders.users.load(user.id)
+        assert len(statements) == 1
+        assert other_user is not loaders.users.load(user.id)
+        assert other_user in other and other_user not in db
+
+        other_user.full_name = "Changed elsewhere"
+        other.commit()
+    finally:
+        other.close()
+
+    # O cache de `db` continua sendo da própria sessão (não vê a escrita até expirar)
+    assert get_loaders(db) is loaders
+    db.expire_all()
+    assert loaders.users.load(user.id).full_name == "Changed elsewhere"
+
+
+
+def test_request_reuses_the_authenticated_user(request_app, make_user):
+    admin, headers = make_user("loader_admin", role_key="SUPER_ADMIN")
+    other, _ = make_user("loader_other")
+
+    def count(user_id):
+        response = request_app(app, "GET", f"/api/v1/users/{user_id}", headers=headers)
+        assert response.json()["status"] == 200
+        return int(response.headers["x-db-query-count"])
+
+    # get_current_user já carregou o próprio usuário: a rota não busca de novo
+    assert count(admin.id) == count(other.id) - 1
@@ -0,0 +1,39 @@
+"""
+Acesso a GET /metrics: token (METRICS_TOKEN) ou, sem token, apenas clientes locais.
+"""
+import pytest
+
+from app.core.config import settings
+from app.main import app
+
+LOCAL = ("127.0.0.1", 50000)
+REMOTE = ("203.0.113.7", 50000)
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    return "scrape-secret"
+
+
+def test_without_token_only_local_clients(request_app, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+
+    local = request_app(app, "GET", "/metrics", client=LOCAL)
+    assert local.status_code == 200
+    assert "http_requests_total" in local.body.decode()
+
+    assert request_app(app, "GET", "/metrics", client=REMOTE).json()["status"] == 404
+
+
+def test_token_is_required_when_configured(request_app, metrics_token):
+    for client in (LOCAL, REMOTE):
+        assert request_app(app, "GET", "/metrics", client=client).json()["status"] == 401
+        wrong = request_app(app, "GET", "/metrics", headers={"Authorization": "Bearer nope"}, client=client)
+        assert wrong.json()["status"] == 401
+
+    response = request_app(
+        app, "GET", "/metrics", headers={"Authorization": f"Bearer {metrics_token}"}, client=REMOTE
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,21 @@
+from app.main import app
+from app.schemas.permission import MAX_PERMISSION_CHECKS
+
+
+def _checks(count: int):
+    return {"checks": [{"module_key": "users", "action": "read"}] * count}
+
+
+def test_check_accepts_up_to_the_limit(request_app, make_user):
+    _, headers = make_user("checker")
+
+    response = request_app(app, "POST", "/api/v1/access/check", headers=headers, body=_checks(MAX_PERMISSION_CHECKS))
+    assert response.status_code == 200
+    assert response.json()["result"] == [False] * MAX_PERMISSION_CHECKS
+
+
+def test_check_rejects_batches_over_the_limit(request_app, make_user):
+    _, headers = make_user("checker")
+
+    response = request_app(app, "POST", "/api/v1/access/check", headers=headers, body=_checks(MAX_PERMISSION_CHECKS + 1))
+    assert response.status_code == 422
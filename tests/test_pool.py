@@ -0,0 +1,41 @@
+from sqlalchemy import create_engine
+
+from app.db.pool import (
+    InstrumentedQueuePool,
+    install_idle_liveness_check,
+    instrument_pool,
+    pool_checked_out,
+    pool_checkouts,
+    pool_ping_failures,
+)
+
+
+def test_failed_idle_ping_counts_one_checkout(tmp_path, monkeypatch):
+    name = "test-idle-ping"
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=InstrumentedQueuePool)
+    instrument_pool(engine, name)
+    install_idle_liveness_check(engine, idle_seconds=0, name=name)
+
+    # A conexão já existe no pool quando o ping falha
+    engine.connect().close()
+    checkouts_before = pool_checkouts.get(pool=name)
+
+    real_ping = engine.dialect.do_ping
+    failures = []
+
+    def ping_failing_once(dbapi_connection):
+        if not failures:
+            failures.append(dbapi_connection)
+            raise engine.dialect.loaded_dbapi.OperationalError("server closed the connection")
+        return real_ping(dbapi_connection)
+
+    monkeypatch.setattr(engine.dialect, "do_ping", ping_failing_once)
+
+    engine.connect().close()
+    engine.connect().close()
+
+    assert len(failures) == 1
+    assert pool_ping_failures.get(pool=name) == 1
+    assert pool_checkouts.get(pool=name) - checkouts_before == 2
+    assert pool_checked_out.get(pool=name) == 0
+    engine.dispose()
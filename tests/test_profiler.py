@@ -0,0 +1,49 @@
+import asyncio
+
+from app.core.instrumentation import RequestStats, current_request_stats
+from app.core.profiler import ProfilerMiddleware, _active_profile, profile_store
+
+
+def _profiled(headers):
+    """Executa um request pelo middleware e diz se o profiler foi iniciado"""
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["profile"] = current_request_stats.get().profile
+        seen["lock_taken"] = _active_profile.locked()
+
+    middleware = ProfilerMiddleware(app)
+    middleware.sample_rate = 0
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/users/", "headers": headers}
+
+    async def run():
+        token = current_request_stats.set(RequestStats(scope))
+        try:
+            await middleware(scope, None, None)
+        finally:
+            current_request_stats.reset(token)
+
+    asyncio.run(run())
+    return seen["profile"] is not None, seen["lock_taken"]
+
+
+def test_anonymous_profile_header_is_ignored():
+    stored = len(profile_store.list())
+    assert _profiled([(b"x-profile", b"1")]) == (False, False)
+    assert len(profile_store.list()) == stored
+
+
+def test_profile_header_with_non_admin_token_is_ignored(make_user):
+    _, headers = make_user("plain_user")
+    authorization = headers["Authorization"].encode()
+
+    assert _profiled([(b"x-profile", b"1"), (b"authorization", authorization)]) == (False, False)
+
+
+def test_profile_header_with_super_admin_token(make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    authorization = headers["Authorization"].encode()
+    stored = len(profile_store.list())
+
+    assert _profiled([(b"x-profile", b"1"), (b"authorization", authorization)]) == (True, True)
+    assert len(profile_store.list()) == stored + 1
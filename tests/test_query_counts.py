@@ -0,0 +1,84 @@
+"""
+Número exato de statements SQL por endpoint (header X-DB-Query-Count).
+
+Trava as correções de N+1: os valores não podem crescer com o tamanho da
+página nem com o número de itens enviados.
+"""
+from app.main import app
+from app.models import Module, Role
+
+
+def query_count(response) -> int:
+    assert response.status_code < 300, response.body
+    return int(response.headers["x-db-query-count"])
+
+
+def _add_modules(db, count: int):
+    db.add_all(Module(key=f"test_module_{index}", name=f"Test module {index}") for index in range(count))
+    db.commit()
+    return [f"test_module_{index}" for index in range(count)]
+
+
+def test_me(request_app, make_user):
+    _, headers = make_user("me_user")
+
+    assert query_count(request_app(app, "GET", "/api/v1/auth/me", headers=headers)) == 1
+
+
+def test_user_list_does_not_grow_with_page_size(request_app, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    for index in range(60):
+        make_user(f"listed_{index}")
+
+    counts = {
+        per_page: query_count(request_app(
+            app, "GET", "/api/v1/users/", f"perPage={per_page}&include=role", headers=headers
+        ))
+        for per_page in (5, 50)
+    }
+    assert counts == {5: 3, 50: 3}
+
+
+def test_user_list_with_role_permissions_does_not_grow_with_page_size(request_app, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    for index in range(60):
+        make_user(f"listed_{index}")
+
+    counts = {
+        per_page: query_count(request_app(
+            app, "GET", "/api/v1/users/", f"perPage={per_page}&include=role.permissions", headers=headers
+        ))
+        for per_page in (5, 50)
+    }
+    assert counts[5] == counts[50] == 4
+
+
+def test_update_role_permissions_does_not_grow_with_items(request_app, db, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    role_id = db.query(Role.id).filter(Role.key == "USER").scalar()
+    module_keys = _add_modules(db, 20)
+
+    def update(size: int, can_read: bool) -> int:
+        payload = {"permissions": [{"module_key": key, "can_read": can_read} for key in module_keys[:size]]}
+        return query_count(request_app(
+            app, "PUT", f"/api/v1/access/roles/{role_id}/permissions", headers=headers, body=payload
+        ))
+
+    # Autenticação, role, módulos, permissões atuais, INSERT/UPDATE em lote, matriz (role, módulos, permissões)
+    assert update(2, True) == 8
+    assert update(20, True) == 8
+    # Só UPDATEs, em um executemany
+    assert update(2, False) == 8
+    assert update(20, False) == 8
+
+
+def test_update_user_role(request_app, db, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    user, _ = make_user("target")
+    role_id = db.query(Role.id).filter(Role.key == "ADMIN").scalar()
+
+    response = request_app(
+        app, "PATCH", f"/api/v1/access/users/{user.id}/role", headers=headers, body={"role_id": role_id}
+    )
+    # Autenticação, usuário, role, UPDATE e refresh do usuário
+    assert query_count(response) == 5
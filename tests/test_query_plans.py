@@ -0,0 +1,92 @@
+"""
+Planos de execução das queries dos services (benchmarks/query_plans.py).
+
+Roda contra um PostgreSQL descartável indicado em QUERY_PLANS_DATABASE_URL
+(recriado pelas migrations e populado com benchmarks.common.seed_dataset);
+sem ela, ou com outro banco, os testes são pulados.
+"""
+import os
+
+import pytest
+
+DATABASE_URL = os.environ.get("QUERY_PLANS_DATABASE_URL", "")
+USERS = int(os.environ.get("QUERY_PLANS_USERS", "5000"))
+ROLES = int(os.environ.get("QUERY_PLANS_ROLES", "20"))
+MODULES = int(os.environ.get("QUERY_PLANS_MODULES", "50"))
+MAX_SCAN_ROWS = 1000
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"),
+    reason="QUERY_PLANS_DATABASE_URL não aponta para um PostgreSQL",
+)
+
+
+@pytest.fixture(scope="module")
+def plans_engine():
+    from sqlalchemy import create_engine, text
+
+    from benchmarks.common import seed_dataset
+
+    seed_dataset(DATABASE_URL, USERS, ROLES, MODULES)
+    engine = create_engine(DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def plans_context(plans_engine):
+    from sqlalchemy.orm import Session
+
+    from benchmarks.query_plans import build_scenarios, table_sizes
+
+    with Session(bind=plans_engine) as db:
+        scenarios = {scenario.name: scenario for scenario in build_scenarios(db)}
+    return scenarios, table_sizes(plans_engine)
+
+
+SCENARIOS = [
+    "user.get_user",
+    "user.get_users_by_ids",
+    "user.get_user_by_email",
+    "user.get_user_by_username",
+    "user.get_user_by_email_or_username",
+    "user.get_user_by_email_or_username_mixed_case",
+    "auth.get_current_user",
+    "user.get_users",
+    "user.get_users_include_role_permissions",
+    "user.get_users_filtered",
+    "role.get_role",
+    "role.get_roles",
+    "role.get_role_include_permissions",
+    "module.get_module_by_key",
+    "authz.has_permission",
+    "authz.check_permissions",
+    "permission.get_role_permissions",
+    "permission.get_role_permission_matrix",
+    "permission.update_role_permissions",
+    "role.delete_role_with_users",
+]
+
+
+def test_migrations_match_model_indexes(plans_engine):
+    from benchmarks.query_plans import index_drift
+
+    assert index_drift(plans_engine) == []
+
+
+@pytest.mark.parametrize("name", SCENARIOS)
+def test_no_unexpected_sequential_scans(plans_engine, plans_context, name):
+    from benchmarks.query_plans import check_scenario, describe, unexpected_scans
+
+    scenarios, tables = plans_context
+    scenario = scenarios[name]
+    _, findings = check_scenario(plans_engine, scenario, tables, MAX_SCAN_ROWS)
+    unexpected = unexpected_scans(scenario, findings)
+    assert not unexpected, "\n".join(describe(finding) for finding in unexpected)
+
+
+def test_every_scenario_is_covered(plans_context):
+    scenarios, _ = plans_context
+    assert set(scenarios) == set(SCENARIOS)
@@ -0,0 +1,47 @@
+from sqlalchemy import create_engine, select
+
+from app.db import session as db_session
+from app.db.session import ReplicaSelector, RoutingSession
+from app.models import User
+
+
+def _use_replicas(monkeypatch, count: int = 2):
+    replicas = [create_engine("sqlite://") for _ in range(count)]
+    monkeypatch.setattr(db_session, "replica_engines", replicas)
+    monkeypatch.setattr(db_session, "replica_selector", ReplicaSelector(replicas, "round_robin"))
+    return replicas
+
+
+def test_replica_is_chosen_once_per_session(monkeypatch):
+    replicas = _use_replicas(monkeypatch)
+    db = RoutingSession(bind=db_session.engine)
+    db.info["read_only"] = True
+
+    binds = {db.get_bind(clause=select(User)) for _ in range(5)}
+    assert len(binds) == 1
+    assert binds.pop() in replicas
+    db.close()
+
+
+def test_new_replica_after_close(monkeypatch):
+    replicas = _use_replicas(monkeypatch)
+    db = RoutingSession(bind=db_session.engine)
+    db.info["read_only"] = True
+
+    first = db.get_bind(clause=select(User))
+    db.close()
+    db.info["read_only"] = True
+    second = db.get_bind(clause=select(User))
+
+    assert {first, second} == set(replicas)
+    db.close()
+
+
+def test_explicit_replica_statements_share_the_session_replica(monkeypatch):
+    _use_replicas(monkeypatch)
+    db = RoutingSession(bind=db_session.engine)
+
+    statement = select(User).execution_options(use_replica=True)
+    assert db.get_bind(clause=select(User)) is db_session.engine
+    assert db.get_bind(clause=statement) is db.get_bind(clause=statement)
+    db.close()
@@ -0,0 +1,29 @@
+"""
+Reset a partir do template (SQLite): templates de outras versões só são apagados com prune.
+"""
+import sqlite3
+
+from app.db.reset import reset_database, template_key
+
+
+def test_template_reset_keeps_other_templates_unless_pruned(tmp_path):
+    database = tmp_path / "app.db"
+    url = f"sqlite:///{database}"
+    other_version = tmp_path / "app.db.tpl-000000000000"
+    other_version.write_bytes(b"")
+
+    reset_database(url, "template")
+
+    current = tmp_path / f"app.db.tpl-{template_key()}"
+    assert current.exists()
+    assert other_version.exists()
+    conn = sqlite3.connect(database)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM roles").fetchone()[0] > 0
+    finally:
+        conn.close()
+
+    reset_database(url, "template", prune=True)
+
+    assert current.exists()
+    assert not other_version.exists()
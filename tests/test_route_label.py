@@ -0,0 +1,79 @@
+from fastapi import APIRouter, FastAPI
+
+from app.core.instrumentation import route_label
+
+
+def _label(request_app, app, method: str, path: str) -> str:
+    scope = {}
+    request_app(app, method, path, scope_out=scope)
+    return route_label(scope)
+
+
+def test_same_relative_path_under_different_prefixes(request_app):
+    users = APIRouter()
+    roles = APIRouter()
+
+    @users.get("/{item_id}")
+    def get_user(item_id: int):
+        return {}
+
+    @roles.get("/{item_id}")
+    def get_role(item_id: int):
+        return {}
+
+    app = FastAPI()
+    app.include_router(users, prefix="/api/users")
+    app.include_router(roles, prefix="/api/roles")
+
+    assert _label(request_app, app, "GET", "/api/users/1") == "/api/users/{item_id}"
+    assert _label(request_app, app, "GET", "/api/roles/1") == "/api/roles/{item_id}"
+
+
+def test_router_included_twice_uses_request_path(request_app):
+    router = APIRouter()
+
+    @router.get("/items")
+    def list_items():
+        return []
+
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+    app.include_router(router, prefix="/v2")
+
+    assert _label(request_app, app, "GET", "/v1/items") == "/v1/items"
+    assert _label(request_app, app, "GET", "/v2/items") == "/v2/items"
+
+
+def test_nested_routers_accumulate_prefixes(request_app):
+    inner = APIRouter()
+
+    @inner.get("/")
+    def list_items():
+        return []
+
+    outer = APIRouter()
+    outer.include_router(inner, prefix="/items")
+    app = FastAPI()
+
+    @app.get("/")
+    def root():
+        return {}
+
+    app.include_router(outer, prefix="/api")
+
+    assert _label(request_app, app, "GET", "/api/items/") == "/api/items/"
+    assert _label(request_app, app, "GET", "/") == "/"
+
+
+def test_application_routes(request_app):
+    from app.main import app
+
+    assert _label(request_app, app, "GET", "/") == "/"
+    assert _label(request_app, app, "GET", "/api/v1/users/") == "/api/v1/users/"
+    assert _label(request_app, app, "GET", "/api/v1/users/1") == "/api/v1/users/{user_id}"
+    assert _label(request_app, app, "POST", "/api/v1/auth/login") == "/api/v1/auth/login"
+
+
+def test_unmatched(request_app):
+    app = FastAPI()
+    assert _label(request_app, app, "GET", "/missing") == "unmatched"
@@ -0,0 +1,65 @@
+"""
+POST /api/v1/users/batch-get: ordem, ids repetidos, ids inexistentes e limite de ids.
+"""
+from app.main import app
+from app.schemas.user import MAX_BATCH_IDS
+
+
+def _batch_get(request_app, headers, ids):
+    return request_app(app, "POST", "/api/v1/users/batch-get", headers=headers, body={"ids": ids})
+
+
+def test_users_come_back_in_request_order(request_app, make_user):
+    _, headers = make_user("batch_caller")
+    ids = [make_user(f"batch_{index}")[0].id for index in range(3)]
+
+    response = _batch_get(request_app, headers, [ids[2], ids[0], ids[1]])
+
+    result = response.json()["result"]
+    assert [user["id"] for user in result["users"]] == [ids[2], ids[0], ids[1]]
+    assert result["missing_ids"] == []
+
+
+def test_repeated_ids_are_returned_once(request_app, make_user):
+    _, headers = make_user("batch_caller")
+    first, second = (make_user(f"batch_{index}")[0].id for index in range(2))
+
+    response = _batch_get(request_app, headers, [second, first, second, first, second])
+
+    assert [user["id"] for user in response.json()["result"]["users"]] == [second, first]
+
+
+def test_missing_ids_are_listed_in_request_order(request_app, make_user):
+    _, headers = make_user("batch_caller")
+    existing = make_user("batch_existing")[0].id
+    missing = [existing + 1000, existing + 999]
+
+    response = _batch_get(request_app, headers, [missing[0], existing, missing[1], missing[0]])
+
+    result = response.json()["result"]
+    assert [user["id"] for user in result["users"]] == [existing]
+    assert result["missing_ids"] == missing
+
+
+def test_batch_runs_one_query_for_the_users(request_app, make_user):
+    _, headers = make_user("batch_caller")
+    few = [make_user(f"batch_{index}")[0].id for index in range(2)]
+    many = few + [make_user(f"batch_more_{index}")[0].id for index in range(20)]
+
+    counts = [
+        int(_batch_get(request_app, headers, ids).headers["x-db-query-count"])
+        for ids in (few, many)
+    ]
+    assert counts[0] == counts[1]
+
+
+def test_id_limit(request_app, make_user):
+    _, headers = make_user("batch_caller")
+
+    assert _batch_get(request_app, headers, list(range(1, MAX_BATCH_IDS + 1))).status_code == 200
+    assert _batch_get(request_app, headers, list(range(1, MAX_BATCH_IDS + 2))).status_code == 422
+    assert _batch_get(request_app, headers, []).status_code == 422
+
+
+def test_requires_authentication(request_app, db):
+    assert _batch_get(request_app, {}, [1]).status_code == 401
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.main import app
+
+
+@pytest.fixture
+def user_selects():
+    """SELECTs na tabela users emitidos durante o teste"""
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", collect)
+    yield statements
+    event.remove(engine, "before_cursor_execute", collect)
+
+
+def _selected_columns(statement: str):
+    columns = statement.split(" FROM ")[0]
+    return {part.strip().split(" AS ")[0].split(".")[-1] for part in columns[len("SELECT"):].split(",")}
+
+
+def test_get_with_fields_selects_only_requested_columns(request_app, make_user, user_selects):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    user, _ = make_user("target")
+
+    response = request_app(app, "GET", f"/api/v1/users/{user.id}", "fields=username,email", headers=headers)
+
+    assert response.status_code == 200
+    assert set(response.json()["result"]) == {"username", "email"}
+    lookup = [statement for statement in user_selects if "users.id = " in statement][-1]
+    assert _selected_columns(lookup) == {"id", "username", "email"}
+
+
+def test_list_with_fields_selects_only_requested_columns(request_app, make_user, user_selects):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    make_user("listed")
+
+    response = request_app(app, "GET", "/api/v1/users/", "fields=id,username", headers=headers)
+
+    assert response.status_code == 200
+    assert all(set(item) == {"id", "username"} for item in response.json()["result"])
+    page = [statement for statement in user_selects if "LIMIT" in statement][-1]
+    assert _selected_columns(page) == {"id", "username"}
+    assert "hashed_password" not in page
+
+
+def test_fields_with_include(request_app, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+    user, _ = make_user("target")
+
+    response = request_app(app, "GET", f"/api/v1/users/{user.id}", "fields=username&include=role", headers=headers)
+
+    assert response.status_code == 200
+    result = response.json()["result"]
+    assert set(result) == {"username", "role"}
+    assert result["role"]["key"] == "USER"
+
+
+def test_unknown_field_is_rejected(request_app, make_user):
+    user, headers = make_user("target")
+
+    response = request_app(app, "GET", f"/api/v1/users/{user.id}", "fields=hashed_password", headers=headers)
+    # Erros de validação da rota vêm no envelope (status do corpo)
+    assert response.json()["status"] == 400
+    assert response.json()["errors"][0]["field"] == "fields"
+
+
+def test_partial_row_is_not_cached_for_other_services(db, make_user):
+    from app.db.loaders import get_loaders
+    from app.services.user_service import get_user
+
+    user, _ = make_user("target")
+    user_id = user.id
+    db.expunge_all()
+
+    partial = get_user(db, user_id, fields=("id", "username"))
+    assert "hashed_password" not in partial.__dict__
+    assert user_id not in get_loaders(db).users._cache
@@ -0,0 +1,43 @@
+from app.main import app
+from app.models import Module, Role, RoleModulePermission
+
+
+def _grant_access_control_read(db):
+    role = db.query(Role).filter(Role.key == "USER").one()
+    module = db.query(Module).filter(Module.key == "access_control").one()
+    db.add(RoleModulePermission(role_id=role.id, module_id=module.id, can_read=True))
+    db.commit()
+
+
+def test_role_permissions_include_requires_access_control_read(request_app, make_user):
+    user, headers = make_user("plain_user")
+
+    for path in ("/api/v1/users/", f"/api/v1/users/{user.id}"):
+        response = request_app(app, "GET", path, "include=role.permissions", headers=headers)
+        assert response.status_code == 403
+        assert "permissions" not in response.body.decode()
+
+
+def test_role_include_does_not_require_access_control(request_app, make_user):
+    user, headers = make_user("plain_user")
+
+    response = request_app(app, "GET", f"/api/v1/users/{user.id}", "include=role", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["result"]["role"]["key"] == "USER"
+
+
+def test_role_permissions_include_with_access_control_read(request_app, db, make_user):
+    _grant_access_control_read(db)
+    user, headers = make_user("reader")
+
+    response = request_app(app, "GET", f"/api/v1/users/{user.id}", "include=role.permissions", headers=headers)
+    assert response.status_code == 200
+    permissions = response.json()["result"]["role"]["permissions"]
+    assert [permission["can_read"] for permission in permissions] == [True]
+
+
+def test_super_admin_can_include_role_permissions(request_app, make_user):
+    _, headers = make_user("admin", role_key="SUPER_ADMIN")
+
+    response = request_app(app, "GET", "/api/v1/users/", "include=role.permissions", headers=headers)
+    assert response.status_code == 200